@@ -6,12 +6,120 @@ This tool analyzes Neo C# test files and generates equivalent C++ tests
 to ensure 100% protocol compatibility.
 """
 
+import functools
+import io
 import os
 import re
 import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Tuple
 
+# Parser patterns, compiled once at import; parse_test_file previously
+# rebuilt them for every file and every method. Bytes patterns let the
+# regex engine run over the raw file without a full UTF-8 decode.
+_TEST_METHOD_RE = re.compile(rb'\[Test(?:Case(?:Source)?)?\]\s*(?:public\s+)?(?:async\s+)?(?:Task\s+)?void\s+(\w+)\s*\([^)]*\)')
+
+
+def _slice_method_body(content: bytes, start: int) -> bytes:
+    """Return the brace-delimited method body beginning at or after start.
+
+    A linear scan with a brace-depth counter and string/comment skip states
+    replaces the per-method DOTALL regex, which re-scanned the whole file
+    for each method and mis-handled nested braces. Indexing bytes yields
+    ints, so the states compare against byte values directly.
+    """
+    open_idx = content.find(b'{', start)
+    if open_idx < 0:
+        return None
+
+    depth = 0
+    in_string = in_char = in_line_comment = in_block_comment = False
+    n = len(content)
+    i = open_idx
+    while i < n:
+        c = content[i]
+        if in_line_comment:
+            if c == 0x0A:  # \n
+                in_line_comment = False
+        elif in_block_comment:
+            if c == 0x2A and content.startswith(b'*/', i):  # *
+                in_block_comment = False
+                i += 1
+        elif in_string:
+            if c == 0x5C:  # backslash
+                i += 1
+            elif c == 0x22:  # "
+                in_string = False
+        elif in_char:
+            if c == 0x5C:  # backslash
+                i += 1
+            elif c == 0x27:  # '
+                in_char = False
+        elif c == 0x2F and i + 1 < n:  # /
+            nxt = content[i + 1]
+            if nxt == 0x2F:  # /
+                in_line_comment = True
+                i += 1
+            elif nxt == 0x2A:  # *
+                in_block_comment = True
+                i += 1
+        elif c == 0x22:  # "
+            in_string = True
+        elif c == 0x27:  # '
+            in_char = True
+        elif c == 0x7B:  # {
+            depth += 1
+        elif c == 0x7D:  # }
+            depth -= 1
+            if depth == 0:
+                return content[open_idx + 1:i]
+        i += 1
+
+    return None
+
+# Common NUnit assertions, fused into one alternation so every body is
+# scanned once instead of once per assertion kind
+_ASSERTION_SPECS = [
+    ('AreEqual', rb'Assert\.AreEqual\((.*?),\s*(.*?)\)', 'EXPECT_EQ'),
+    ('AreNotEqual', rb'Assert\.AreNotEqual\((.*?),\s*(.*?)\)', 'EXPECT_NE'),
+    ('IsTrue', rb'Assert\.IsTrue\((.*?)\)', 'EXPECT_TRUE'),
+    ('IsFalse', rb'Assert\.IsFalse\((.*?)\)', 'EXPECT_FALSE'),
+    ('IsNull', rb'Assert\.IsNull\((.*?)\)', 'EXPECT_EQ({}, nullptr)'),
+    ('IsNotNull', rb'Assert\.IsNotNull\((.*?)\)', 'EXPECT_NE({}, nullptr)'),
+    ('Throws', rb'Assert\.Throws<(\w+)>\((.*?)\)', 'EXPECT_THROW({}, {})'),
+]
+
+_ALL_ASSERT_RE = re.compile(b'|'.join(
+    b'(?P<' + name.encode() + b'>' + pattern + b')'
+    for name, pattern, _ in _ASSERTION_SPECS
+))
+
+_NAME_TO_MACRO = {name: macro for name, _, macro in _ASSERTION_SPECS}
+
+_HEX_RE = re.compile(rb'"([0-9a-fA-F]{2,})"')
+_BYTE_ARRAY_RE = re.compile(rb'new\s+byte\[\]\s*\{([^}]+)\}')
+_NUMBER_RE = re.compile(rb'\b(\d+)[UL]?\b')
+
+# Category keywords, in priority order for alternation ties
+_CATEGORIES = {
+    'crypto': ['sign', 'verify', 'hash', 'ecdsa', 'key'],
+    'vm': ['opcode', 'stack', 'execute', 'script'],
+    'consensus': ['dbft', 'consensus', 'view', 'commit'],
+    'transaction': ['tx', 'transaction', 'witness', 'attribute'],
+    'block': ['block', 'header', 'merkle'],
+    'contract': ['contract', 'nep', 'native', 'deploy'],
+    'network': ['p2p', 'message', 'peer', 'protocol'],
+    'wallet': ['wallet', 'account', 'nep6', 'wif'],
+}
+
+# One alternation with a named group per category replaces the nested
+# O(categories x keywords) substring loop in categorize_test
+_CATEGORY_RE = re.compile('|'.join(
+    f"(?P<{cat}>{'|'.join(map(re.escape, kws))})" for cat, kws in _CATEGORIES.items()
+))
+
 class CSharpTestParser:
     """Parse C# test files and extract test cases"""
     
@@ -22,106 +130,89 @@ class CSharpTestParser:
     def parse_test_file(self, file_path: Path) -> List[Dict]:
         """Parse a single C# test file"""
         tests = []
-        
-        with open(file_path, 'r') as f:
-            content = f.read()
-            
-        # Extract test methods
-        test_pattern = r'\[Test(?:Case(?:Source)?)?\]\s*(?:public\s+)?(?:async\s+)?(?:Task\s+)?void\s+(\w+)\s*\([^)]*\)'
-        test_methods = re.findall(test_pattern, content)
-        
-        for method_name in test_methods:
-            # Extract test body
-            method_pattern = rf'void\s+{method_name}\s*\([^)]*\)\s*\{{(.*?)\n\s*\}}'
-            match = re.search(method_pattern, content, re.DOTALL)
-            
-            if match:
-                test_body = match.group(1)
-                
-                # Extract assertions
-                assertions = self.extract_assertions(test_body)
-                
-                # Extract test data
-                test_data = self.extract_test_data(test_body)
-                
-                tests.append({
-                    'name': method_name,
-                    'category': self.categorize_test(method_name),
-                    'assertions': assertions,
-                    'test_data': test_data,
-                    'original_body': test_body
-                })
-                
+
+        # Raw bytes skip the whole-file UTF-8 decode; only the captured
+        # values that end up in the result dicts are decoded below.
+        content = Path(file_path).read_bytes()
+
+        # Each attribute match hands its signature end to the tokenizer,
+        # which slices the body without rescanning the file.
+        for match in _TEST_METHOD_RE.finditer(content):
+            method_name = match.group(1).decode('ascii')
+            test_body = _slice_method_body(content, match.end())
+            if test_body is None:
+                continue
+
+            # Extract assertions
+            assertions = self.extract_assertions(test_body)
+
+            # Extract test data
+            test_data = self.extract_test_data(test_body)
+
+            tests.append({
+                'name': method_name,
+                'category': self.categorize_test(method_name),
+                'assertions': assertions,
+                'test_data': test_data,
+                'original_body': test_body.decode('utf-8', 'replace')
+            })
+
         return tests
     
-    def extract_assertions(self, test_body: str) -> List[Dict]:
+    def extract_assertions(self, test_body: bytes) -> List[Dict]:
         """Extract assertions from test body"""
         assertions = []
-        
-        # Common NUnit assertions
-        patterns = [
-            (r'Assert\.AreEqual\((.*?),\s*(.*?)\)', 'EXPECT_EQ'),
-            (r'Assert\.AreNotEqual\((.*?),\s*(.*?)\)', 'EXPECT_NE'),
-            (r'Assert\.IsTrue\((.*?)\)', 'EXPECT_TRUE'),
-            (r'Assert\.IsFalse\((.*?)\)', 'EXPECT_FALSE'),
-            (r'Assert\.IsNull\((.*?)\)', 'EXPECT_EQ({}, nullptr)'),
-            (r'Assert\.IsNotNull\((.*?)\)', 'EXPECT_NE({}, nullptr)'),
-            (r'Assert\.Throws<(\w+)>\((.*?)\)', 'EXPECT_THROW({}, {})'),
-        ]
-        
-        for pattern, cpp_macro in patterns:
-            matches = re.findall(pattern, test_body)
-            for match in matches:
-                assertions.append({
-                    'type': cpp_macro,
-                    'args': match if isinstance(match, tuple) else (match,)
-                })
-                
+
+        # One finditer pass over the fused alternation; lastgroup names
+        # the matched assertion kind. Only the winning alternative's
+        # groups are non-None: the first is its full text, the rest are
+        # the argument captures. (macro, args) tuples are a fraction of
+        # the size of the per-assertion dicts they replace, and interning
+        # collapses the many repeated argument strings.
+        for match in _ALL_ASSERT_RE.finditer(test_body):
+            groups = [g for g in match.groups() if g is not None]
+            assertions.append((_NAME_TO_MACRO[match.lastgroup], tuple(
+                sys.intern(arg.decode('utf-8', 'replace'))
+                for arg in groups[1:])))
+
         return assertions
-    
-    def extract_test_data(self, test_body: str) -> Dict:
+
+    def extract_test_data(self, test_body: bytes) -> Dict:
         """Extract test data and constants"""
         test_data = {}
-        
-        # Extract hex strings
-        hex_pattern = r'"([0-9a-fA-F]{2,})"'
-        hex_strings = re.findall(hex_pattern, test_body)
+
+        # finditer streams each match straight into its comprehension, so
+        # no intermediate all-matches list is materialized per body
+        hex_strings = [
+            sys.intern(m.group(1).decode('ascii')) for m in _HEX_RE.finditer(test_body)]
         if hex_strings:
             test_data['hex_strings'] = hex_strings
-            
+
         # Extract byte arrays
-        byte_array_pattern = r'new\s+byte\[\]\s*\{([^}]+)\}'
-        byte_arrays = re.findall(byte_array_pattern, test_body)
+        byte_arrays = [
+            m.group(1).decode('utf-8', 'replace')
+            for m in _BYTE_ARRAY_RE.finditer(test_body)
+        ]
         if byte_arrays:
             test_data['byte_arrays'] = byte_arrays
-            
-        # Extract numerical constants
-        number_pattern = r'\b(\d+)[UL]?\b'
-        numbers = re.findall(number_pattern, test_body)
+
+        # Extract numerical constants, deduped and sorted for determinism
+        numbers = sorted({m.group(1) for m in _NUMBER_RE.finditer(test_body)})
         if numbers:
-            test_data['numbers'] = list(set(numbers))
-            
+            test_data['numbers'] = [sys.intern(n.decode('ascii')) for n in numbers]
+
         return test_data
     
     def categorize_test(self, test_name: str) -> str:
         """Categorize test based on name"""
-        categories = {
-            'crypto': ['sign', 'verify', 'hash', 'ecdsa', 'key'],
-            'vm': ['opcode', 'stack', 'execute', 'script'],
-            'consensus': ['dbft', 'consensus', 'view', 'commit'],
-            'transaction': ['tx', 'transaction', 'witness', 'attribute'],
-            'block': ['block', 'header', 'merkle'],
-            'contract': ['contract', 'nep', 'native', 'deploy'],
-            'network': ['p2p', 'message', 'peer', 'protocol'],
-            'wallet': ['wallet', 'account', 'nep6', 'wif'],
-        }
-        
-        test_name_lower = test_name.lower()
-        for category, keywords in categories.items():
-            if any(keyword in test_name_lower for keyword in keywords):
-                return category
-                
-        return 'general'
+        match = _CATEGORY_RE.search(test_name.lower())
+        return match.lastgroup if match else 'general'
+
+
+def _parse_one(file_path: Path) -> List[Dict]:
+    """Parse a single file; module-level so it pickles into worker processes."""
+    return CSharpTestParser(file_path.parent).parse_test_file(file_path)
+
 
 class CppTestGenerator:
     """Generate C++ test files from parsed C# tests"""
@@ -132,8 +223,14 @@ class CppTestGenerator:
         
     def generate_test_file(self, category: str, tests: List[Dict]) -> str:
         """Generate a C++ test file for a category"""
-        
-        cpp_content = f"""/**
+
+        # Computed once per category instead of twice per test
+        class_name = f"{self.to_camel_case(category)}MigratedTest"
+
+        # StringIO appends in amortized O(1); += on a str reallocates the
+        # whole buffer per test case
+        buf = io.StringIO()
+        buf.write(f"""/**
  * @file test_{category}_migrated.cpp
  * @brief Tests migrated from Neo C# for {category} category
  * @note Auto-generated from C# tests - DO NOT EDIT MANUALLY
@@ -144,7 +241,7 @@ class CppTestGenerator:
 
 using namespace neo;
 
-class {self.to_camel_case(category)}MigratedTest : public ::testing::Test {{
+class {class_name} : public ::testing::Test {{
 protected:
     void SetUp() override {{
         // Setup code
@@ -155,42 +252,42 @@ protected:
     }}
 }};
 
-"""
-        
+""")
+
         for test in tests:
-            cpp_content += self.generate_test_case(test, category)
-            
-        return cpp_content
-    
-    def generate_test_case(self, test: Dict, category: str) -> str:
+            buf.write(self.generate_test_case(test, class_name))
+
+        return buf.getvalue()
+
+    def generate_test_case(self, test: Dict, class_name: str) -> str:
         """Generate a single test case"""
-        
+
         test_name = test['name']
-        cpp_test = f"""
-TEST_F({self.to_camel_case(category)}MigratedTest, {test_name}) {{
+        buf = io.StringIO()
+        buf.write(f"""
+TEST_F({class_name}, {test_name}) {{
     // Migrated from C# test: {test_name}
-    
-"""
-        
+
+""")
+
         # Add test data setup
         if 'hex_strings' in test.get('test_data', {}):
             for hex_str in test['test_data']['hex_strings']:
-                cpp_test += f'    auto data = ByteVector::Parse("{hex_str}");\n'
-                
+                buf.write(f'    auto data = ByteVector::Parse("{hex_str}");\n')
+
         # Convert assertions
         for assertion in test.get('assertions', []):
-            cpp_test += f"    {self.convert_assertion(assertion)};\n"
-            
-        cpp_test += "}\n"
-        
-        return cpp_test
+            buf.write(f"    {self.convert_assertion(assertion)};\n")
+
+        buf.write("}\n")
+
+        return buf.getvalue()
     
-    def convert_assertion(self, assertion: Dict) -> str:
-        """Convert C# assertion to C++ GTest macro"""
-        
-        macro = assertion['type']
-        args = assertion['args']
-        
+    def convert_assertion(self, assertion: Tuple) -> str:
+        """Convert a (macro, args) assertion to a C++ GTest macro call"""
+
+        macro, args = assertion
+
         if len(args) == 1:
             return f"{macro}({args[0]})"
         elif len(args) == 2:
@@ -198,7 +295,9 @@ TEST_F({self.to_camel_case(category)}MigratedTest, {test_name}) {{
         else:
             return f"// TODO: Convert assertion with {len(args)} args"
     
-    def to_camel_case(self, snake_str: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def to_camel_case(snake_str: str) -> str:
         """Convert snake_case to CamelCase"""
         components = snake_str.split('_')
         return ''.join(x.title() for x in components)
@@ -215,6 +314,13 @@ class TestMigrationOrchestrator:
             'migrated_tests': 0,
             'categories': {}
         }
+        # Parsed results keyed by path with (mtime_ns, size) validators,
+        # so unchanged files skip the parse on incremental runs
+        self._cache_file = self.generator.output_path / '.migration_cache.json'
+        try:
+            self._parse_cache = json.loads(self._cache_file.read_text())
+        except (OSError, ValueError):
+            self._parse_cache = {}
         
     def migrate_all_tests(self):
         """Migrate all C# test files to C++"""
@@ -225,11 +331,32 @@ class TestMigrationOrchestrator:
         print(f"📋 Found {len(cs_test_files)} C# test files")
         
         categorized_tests = {}
-        
+
+        # Unchanged files reuse their cached parse; only stale ones go to
+        # the worker pool.
+        parsed_by_path = {}
+        stale_files = []
         for test_file in cs_test_files:
-            print(f"  Parsing: {test_file.name}")
-            tests = self.parser.parse_test_file(test_file)
-            
+            st = test_file.stat()
+            entry = self._parse_cache.get(str(test_file))
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                parsed_by_path[str(test_file)] = entry[2]
+            else:
+                stale_files.append((test_file, st))
+
+        # Parsing is regex-heavy and GIL-bound, so independent files fan
+        # out across worker processes; results come back in input order.
+        if stale_files:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                parsed = list(executor.map(_parse_one, [f for f, _ in stale_files], chunksize=8))
+            for (test_file, st), tests in zip(stale_files, parsed):
+                parsed_by_path[str(test_file)] = tests
+                self._parse_cache[str(test_file)] = [st.st_mtime_ns, st.st_size, tests]
+
+        for test_file in cs_test_files:
+            tests = parsed_by_path[str(test_file)]
+            print(f"  Parsed: {test_file.name} ({len(tests)} tests)")
+
             for test in tests:
                 category = test['category']
                 if category not in categorized_tests:
@@ -249,30 +376,31 @@ class TestMigrationOrchestrator:
             cpp_content = self.generator.generate_test_file(category, tests)
             output_file = self.generator.output_path / f"test_{category}_migrated.cpp"
             
-            with open(output_file, 'w') as f:
-                f.write(cpp_content)
+            # One encode and one write syscall per file; the buffered text
+            # path would chunk large categories through an 8KB buffer
+            output_file.write_bytes(cpp_content.encode())
                 
             print(f"  ✅ Generated: {output_file.name}")
             self.migration_stats['migrated_tests'] += len(tests)
-            
+
+        self._save_parse_cache()
         self.generate_migration_report()
-        
+
+    def _save_parse_cache(self):
+        """Persist the parse cache atomically for the next run."""
+        tmp_file = self._cache_file.with_suffix('.json.tmp')
+        tmp_file.write_text(json.dumps(self._parse_cache))
+        os.replace(tmp_file, self._cache_file)
+
     def find_cs_test_files(self) -> List[Path]:
         """Find all C# test files"""
-        
-        # Common patterns for C# test files
-        patterns = [
-            "*Test.cs",
-            "*Tests.cs",
-            "*Spec.cs",
-            "UT_*.cs"
-        ]
-        
-        test_files = []
-        for pattern in patterns:
-            test_files.extend(self.parser.cs_test_path.rglob(pattern))
-            
-        return test_files
+
+        # One rglob pass with a name filter replaces four full directory
+        # walks (and stops files like UT_FooTest.cs matching twice)
+        return sorted(
+            p for p in self.parser.cs_test_path.rglob('*.cs')
+            if p.name.startswith('UT_') or p.name.endswith(('Test.cs', 'Tests.cs', 'Spec.cs'))
+        )
     
     def generate_migration_report(self):
         """Generate migration report"""
@@ -4,13 +4,33 @@ Quick Test Runner for Neo C++
 Builds and runs available tests with simple reporting
 """
 
+import mmap
 import os
+import re
 import subprocess
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# GTest run summary, compiled once; pulls total count, elapsed time and
+# the failed count (absent when everything passed) in a single search
+_GTEST_SUMMARY_RE = re.compile(
+    r'\[==========\] (\d+) tests? from .* \((\d+) ms.*\)\s*'
+    r'\[  PASSED  \] (\d+) tests?(?:.*\[  FAILED  \] (\d+))?',
+    re.S
+)
+
+# Bytes pattern so target discovery can scan memory-mapped CMake files
+# without decoding them
+_ADD_EXE_RE = re.compile(rb'add_executable\((test_\w+)')
+
 class QuickTestRunner:
     def __init__(self):
         self.results = {
@@ -43,16 +63,30 @@ class QuickTestRunner:
                 return False
         return True
         
-    def build_test(self, test_name):
-        """Build a specific test target"""
-        print(f"Building {test_name}...")
-        result = subprocess.run(
-            ['make', test_name, '-j4'],
-            cwd=self.build_dir,
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
+    def build_tests(self, test_names):
+        """Build all test targets in one maximally parallel invocation"""
+        if not test_names:
+            return True
+
+        print(f"Building {len(test_names)} test targets...")
+        # One build-tool run schedules every target at once instead of
+        # paying process startup and a dependency scan per target; ninja
+        # additionally keeps its graph in memory for the whole batch.
+        if (self.build_dir / 'build.ninja').exists():
+            cmd = ['ninja', *test_names]
+        else:
+            cmd = ['make', *test_names, f'-j{os.cpu_count()}']
+
+        try:
+            result = subprocess.run(
+                cmd,
+                cwd=self.build_dir,
+                capture_output=True,
+                text=True,
+                timeout=600
+            )
+        except subprocess.TimeoutExpired:
+            return False
         return result.returncode == 0
         
     def run_test(self, test_path):
@@ -62,25 +96,27 @@ class QuickTestRunner:
             
         print(f"Running {test_path}...")
         try:
+            # One merged pipe halves the read syscalls versus separate
+            # stdout/stderr captures
             result = subprocess.run(
                 [test_path, '--gtest_brief=1'],
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
                 timeout=30
             )
-            
-            # Parse output
-            output = result.stdout + result.stderr
-            passed = 'PASSED' in output or result.returncode == 0
-            
-            # Try to extract test counts
-            test_count = 0
-            if 'tests from' in output:
-                import re
-                match = re.search(r'(\d+) tests from', output)
-                if match:
-                    test_count = int(match.group(1))
-                    
+
+            # One pass over the summary; a failing run that still lists
+            # '[  PASSED  ]' lines no longer reads as a pass
+            match = _GTEST_SUMMARY_RE.search(result.stdout)
+            if match:
+                test_count = int(match.group(1))
+                passed = int(match.group(4) or 0) == 0
+            else:
+                test_count = 0
+                passed = result.returncode == 0
+
+            output = result.stdout
             return {
                 'passed': passed,
                 'test_count': test_count,
@@ -101,8 +137,8 @@ class QuickTestRunner:
             
     def find_test_targets(self):
         """Find available test targets from CMakeLists"""
-        targets = []
-        
+        targets = set()
+
         # Look for test targets in various CMakeLists.txt files
         cmake_files = [
             'tests/unit/CMakeLists.txt',
@@ -114,17 +150,51 @@ class QuickTestRunner:
             'tests/unit/consensus/CMakeLists.txt',
             'sdk/tests/CMakeLists.txt'
         ]
-        
+
+        # CMake files change rarely, so targets from a previous run are
+        # reused as long as the file's mtime is unchanged; only edited
+        # files pay the read + regex scan
+        cache_path = Path('.qtr_cache.json')
+        try:
+            cache = json.loads(cache_path.read_text())
+        except (OSError, ValueError):
+            cache = {}
+
+        dirty = False
         for cmake_file in cmake_files:
-            if Path(cmake_file).exists():
-                with open(cmake_file, 'r') as f:
-                    content = f.read()
-                    # Extract test targets
-                    import re
-                    matches = re.findall(r'add_executable\((test_\w+)', content)
-                    targets.extend(matches)
-                    
-        return list(set(targets))  # Remove duplicates
+            path = Path(cmake_file)
+            try:
+                mtime_ns = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+
+            entry = cache.get(cmake_file)
+            if entry and entry[0] == mtime_ns:
+                targets.update(entry[1])
+                continue
+
+            # finditer over a memory map keeps the scan constant-memory
+            # even for large generated CMake files; the set dedupes as
+            # matches stream in
+            try:
+                with open(cmake_file, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    found = sorted(
+                        m.group(1).decode() for m in _ADD_EXE_RE.finditer(mm))
+            except ValueError:  # empty file
+                found = []
+            cache[cmake_file] = [mtime_ns, found]
+            targets.update(found)
+            dirty = True
+
+        if dirty:
+            # Atomic replace so an interrupted run never leaves a
+            # truncated cache behind
+            tmp_path = cache_path.with_suffix('.json.tmp')
+            tmp_path.write_text(json.dumps(cache))
+            os.replace(tmp_path, cache_path)
+
+        return list(targets)
         
     def run_all_tests(self):
         """Main test execution"""
@@ -159,51 +229,54 @@ class QuickTestRunner:
                 test_targets.remove(p)
         ordered_targets.extend(test_targets[:10])  # Add up to 10 more tests
         
-        # Build and run tests
+        # Build everything up front, then run; partial build failures
+        # still leave the successfully built executables runnable
+        if not self.build_tests(ordered_targets):
+            print("  ⚠ Batch build reported errors; running available executables")
+
+        # One walk of the build tree replaces eight stat probes per
+        # target; the index then resolves every name in O(1)
+        exe_index = {
+            p.name: str(p)
+            for p in self.build_dir.rglob('test_*')
+            if p.is_file() and os.access(p, os.X_OK)
+        }
+
+        runnable = []
         for test_name in ordered_targets:
+            test_path = exe_index.get(test_name)
+            if test_path:
+                runnable.append((test_name, test_path))
+            else:
+                print(f"  ⚠ Test executable not found for {test_name}")
+
+        # The binaries are independent processes, so run them concurrently:
+        # wall time tracks the slowest test instead of the sum of all.
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            run_results = list(executor.map(
+                self.run_test, (path for _, path in runnable)))
+
+        for (test_name, test_path), result in zip(runnable, run_results):
             print(f"\n--- Testing {test_name} ---")
-            
-            # Build
-            if self.build_test(test_name):
-                # Find the executable
-                test_paths = [
-                    f'build/tests/unit/{test_name}',
-                    f'build/tests/unit/io/{test_name}',
-                    f'build/tests/unit/cryptography/{test_name}',
-                    f'build/tests/unit/vm/{test_name}',
-                    f'build/tests/unit/network/{test_name}',
-                    f'build/tests/unit/ledger/{test_name}',
-                    f'build/tests/unit/consensus/{test_name}',
-                    f'build/sdk/tests/{test_name}'
-                ]
-                
-                test_run = False
-                for test_path in test_paths:
-                    if Path(test_path).exists():
-                        result = self.run_test(test_path)
-                        if result:
-                            self.results['tests_run'] += 1
-                            if result['passed']:
-                                self.results['tests_passed'] += 1
-                                print(f"  ✓ PASSED ({result['test_count']} tests)")
-                            else:
-                                self.results['tests_failed'] += 1
-                                print(f"  ✗ FAILED")
-                                print(f"    {result['output'][:200]}")
-                                
-                            self.results['test_details'].append({
-                                'name': test_name,
-                                'path': test_path,
-                                'passed': result['passed'],
-                                'test_count': result['test_count']
-                            })
-                            test_run = True
-                            break
-                            
-                if not test_run:
-                    print(f"  ⚠ Test executable not found after build")
+            if not result:
+                print(f"  ⚠ Test executable not found after build")
+                continue
+
+            self.results['tests_run'] += 1
+            if result['passed']:
+                self.results['tests_passed'] += 1
+                print(f"  ✓ PASSED ({result['test_count']} tests)")
             else:
-                print(f"  ⚠ Build failed")
+                self.results['tests_failed'] += 1
+                print(f"  ✗ FAILED")
+                print(f"    {result['output'][:200]}")
+
+            self.results['test_details'].append({
+                'name': test_name,
+                'path': test_path,
+                'passed': result['passed'],
+                'test_count': result['test_count']
+            })
                 
         # Generate report
         self.generate_report()
@@ -229,9 +302,13 @@ class QuickTestRunner:
             else:
                 print("✗ Low test coverage - significant issues")
                 
-        # Save results to file
+        # Save results to file; orjson serializes large captured outputs
+        # several times faster than the pure-Python encoder
         with open('quick_test_results.json', 'w') as f:
-            json.dump(self.results, f, indent=2)
+            if orjson is not None:
+                f.write(orjson.dumps(self.results, option=orjson.OPT_INDENT_2).decode())
+            else:
+                json.dump(self.results, f, indent=2)
         print(f"\nDetailed results saved to quick_test_results.json")
         
         # Create markdown report
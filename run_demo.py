@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Neo C++ Node Demo Helper
+
+Lists the Neo executables available in the working directory and shows
+the head of the most recent node output log.
+"""
+
+import itertools
+import os
+import re
+
+# Matches neo build artifacts case-insensitively without allocating a
+# lowered copy of every directory entry name
+_NEO_EXE_RE = re.compile(rb'(?i)neo.*(?:\.exe|node)')
+
+
+def main():
+    print("=" * 60)
+    print("NEO C++ NODE DEMO")
+    print("=" * 60)
+
+    print("\nAvailable Neo executables:")
+    found = False
+    # scandir streams cached DirEntry objects from one getdents pass,
+    # avoiding the listdir + per-entry stat pattern
+    for entry in os.scandir('.'):
+        if _NEO_EXE_RE.search(entry.name.encode()):
+            print(f"  {entry.name}")
+            found = True
+    if not found:
+        print("  (none found - build the project first)")
+
+    if os.path.exists('neo_node_output.txt'):
+        print("\nLast node output:")
+        # islice stops reading after ten lines, so memory stays constant
+        # no matter how large the log has grown
+        with open('neo_node_output.txt', 'r') as f:
+            for line in itertools.islice(f, 10):
+                print(f"  {line.rstrip()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,209 +4,328 @@ add_file_headers.py - Add missing @file documentation headers
 Automatically adds Doxygen file headers to C++ files missing them.
 """
 
+import json
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
+# Directories never worth descending into; pruned at the parent so we
+# skip the whole subtree instead of filtering paths after the fact
+_EXCLUDED_DIRS = frozenset(('third_party', 'build', '.git'))
+_CPP_EXTS = frozenset(('.h', '.hpp', '.cpp', '.cc'))
+_HEADER_EXTS = frozenset(('.h', '.hpp'))
+
+def _iter_cpp_files(root):
+    """Yield (path, ext) pairs for C++ sources under root, pruning excluded dirs."""
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                # d_type from readdir answers is_dir/is_file without an
+                # extra stat syscall per entry
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _EXCLUDED_DIRS:
+                        stack.append(entry.path)
+                elif entry.is_file():
+                    # One rfind plus a set-hash lookup instead of the
+                    # tuple-endswith chain of suffix comparisons
+                    name = entry.name
+                    dot = name.rfind('.')
+                    if dot != -1 and name[dot:] in _CPP_EXTS:
+                        yield entry.path, name[dot:]
+
+# Built once at import; the per-call dict literal rebuilt ~80 entries for
+# every file processed
+_DESCRIPTIONS = {
+    'blockchain': 'Core blockchain implementation',
+    'consensus_service': 'dBFT consensus service implementation',
+    'memory_pool': 'Transaction memory pool management',
+    'transaction': 'Transaction types and processing',
+    'block': 'Block structure and validation',
+    'neo_system': 'Main Neo system coordinator',
+    'vm': 'Virtual machine implementation',
+    'opcode': 'VM operation codes',
+    'application_engine': 'Smart contract execution engine',
+    'native_contract': 'Native contract implementations',
+    'neo_token': 'NEO governance token contract',
+    'gas_token': 'GAS utility token contract',
+    'crypto': 'Cryptographic operations',
+    'ecc': 'Elliptic curve cryptography',
+    'hash': 'Hashing algorithms',
+    'merkle_tree': 'Merkle tree implementation',
+    'rpc_server': 'JSON-RPC server implementation',
+    'p2p': 'Peer-to-peer networking',
+    'tcp_connection': 'TCP network connections',
+    'message': 'Network message handling',
+    'storage': 'Persistent storage management',
+    'rocksdb_store': 'RocksDB storage backend',
+    'data_cache': 'Data caching layer',
+    'serializable': 'Serialization interfaces',
+    'json': 'JSON serialization utilities',
+    'uint160': '160-bit unsigned integer type',
+    'uint256': '256-bit unsigned integer type',
+    'fixed8': 'Fixed-point decimal type',
+    'logger': 'Logging infrastructure',
+    'settings': 'Configuration settings',
+    'protocol_settings': 'Protocol configuration',
+    'metrics': 'Performance metrics collection',
+    'test': 'Unit tests',
+    'mock': 'Mock implementations for testing',
+    'helper': 'Helper utilities',
+    'utils': 'Utility functions',
+    'types': 'Type definitions',
+    'constants': 'Constant definitions',
+    'enums': 'Enumeration definitions',
+    'exceptions': 'Exception types',
+    'interfaces': 'Interface definitions',
+    'factory': 'Factory pattern implementations',
+    'manager': 'Management components',
+    'service': 'Service implementations',
+    'handler': 'Event and message handlers',
+    'validator': 'Validation logic',
+    'verifier': 'Verification components',
+    'builder': 'Builder pattern implementations',
+    'pool': 'Resource pooling',
+    'cache': 'Caching mechanisms',
+    'queue': 'Queue data structures',
+    'buffer': 'Buffer management',
+    'stream': 'Stream processing',
+    'codec': 'Encoding/decoding operations',
+    'parser': 'Parsing utilities',
+    'formatter': 'Data formatting',
+    'converter': 'Type conversion utilities',
+    'wrapper': 'Wrapper implementations',
+    'adapter': 'Adapter pattern implementations',
+    'proxy': 'Proxy pattern implementations',
+    'delegate': 'Delegation mechanisms',
+    'observer': 'Observer pattern implementations',
+    'event': 'Event handling',
+    'callback': 'Callback mechanisms',
+    'thread': 'Threading utilities',
+    'sync': 'Synchronization primitives',
+    'lock': 'Locking mechanisms',
+    'atomic': 'Atomic operations',
+    'config': 'Configuration management',
+    'init': 'Initialization logic',
+    'startup': 'Startup procedures',
+    'shutdown': 'Shutdown procedures',
+    'cleanup': 'Cleanup utilities',
+}
+
+# Stable snapshot of the items so the fallback scan skips dict-view
+# construction each call
+_DESC_ITEMS = tuple(_DESCRIPTIONS.items())
+
+# Sampled once: a run does not straddle midnight often enough to justify
+# a gettimeofday per file
+_CURRENT_YEAR = datetime.now().year
+
+# Header template with the constant parts baked in; only the two
+# per-file fields are interpolated per call
+_HEADER_TPL = f'''/**
+ * @file {{filename}}
+ * @brief {{brief}}
+ * @author Neo C++ Team
+ * @date {_CURRENT_YEAR}
+ * @copyright MIT License
+ */
+
+'''
+
+@lru_cache(maxsize=4096)
 def get_brief_description(filename):
     """Generate a brief description based on filename."""
+    # Deterministic in its argument, and the same stems recur across the
+    # tree (foo.h next to foo.cpp), so memoize the substring fallback
     # Remove extension and path
     name = Path(filename).stem
-    
-    # Convert snake_case to Title Case
-    words = name.replace('_', ' ').split()
-    
-    # Special cases
-    descriptions = {
-        'blockchain': 'Core blockchain implementation',
-        'consensus_service': 'dBFT consensus service implementation',
-        'memory_pool': 'Transaction memory pool management',
-        'transaction': 'Transaction types and processing',
-        'block': 'Block structure and validation',
-        'neo_system': 'Main Neo system coordinator',
-        'vm': 'Virtual machine implementation',
-        'opcode': 'VM operation codes',
-        'application_engine': 'Smart contract execution engine',
-        'native_contract': 'Native contract implementations',
-        'neo_token': 'NEO governance token contract',
-        'gas_token': 'GAS utility token contract',
-        'crypto': 'Cryptographic operations',
-        'ecc': 'Elliptic curve cryptography',
-        'hash': 'Hashing algorithms',
-        'merkle_tree': 'Merkle tree implementation',
-        'rpc_server': 'JSON-RPC server implementation',
-        'p2p': 'Peer-to-peer networking',
-        'tcp_connection': 'TCP network connections',
-        'message': 'Network message handling',
-        'storage': 'Persistent storage management',
-        'rocksdb_store': 'RocksDB storage backend',
-        'data_cache': 'Data caching layer',
-        'serializable': 'Serialization interfaces',
-        'json': 'JSON serialization utilities',
-        'uint160': '160-bit unsigned integer type',
-        'uint256': '256-bit unsigned integer type',
-        'fixed8': 'Fixed-point decimal type',
-        'logger': 'Logging infrastructure',
-        'settings': 'Configuration settings',
-        'protocol_settings': 'Protocol configuration',
-        'metrics': 'Performance metrics collection',
-        'test': 'Unit tests',
-        'mock': 'Mock implementations for testing',
-        'helper': 'Helper utilities',
-        'utils': 'Utility functions',
-        'types': 'Type definitions',
-        'constants': 'Constant definitions',
-        'enums': 'Enumeration definitions',
-        'exceptions': 'Exception types',
-        'interfaces': 'Interface definitions',
-        'factory': 'Factory pattern implementations',
-        'manager': 'Management components',
-        'service': 'Service implementations',
-        'handler': 'Event and message handlers',
-        'validator': 'Validation logic',
-        'verifier': 'Verification components',
-        'builder': 'Builder pattern implementations',
-        'pool': 'Resource pooling',
-        'cache': 'Caching mechanisms',
-        'queue': 'Queue data structures',
-        'buffer': 'Buffer management',
-        'stream': 'Stream processing',
-        'codec': 'Encoding/decoding operations',
-        'parser': 'Parsing utilities',
-        'formatter': 'Data formatting',
-        'converter': 'Type conversion utilities',
-        'wrapper': 'Wrapper implementations',
-        'adapter': 'Adapter pattern implementations',
-        'proxy': 'Proxy pattern implementations',
-        'delegate': 'Delegation mechanisms',
-        'observer': 'Observer pattern implementations',
-        'event': 'Event handling',
-        'callback': 'Callback mechanisms',
-        'thread': 'Threading utilities',
-        'sync': 'Synchronization primitives',
-        'lock': 'Locking mechanisms',
-        'atomic': 'Atomic operations',
-        'config': 'Configuration management',
-        'init': 'Initialization logic',
-        'startup': 'Startup procedures',
-        'shutdown': 'Shutdown procedures',
-        'cleanup': 'Cleanup utilities',
-    }
-    
-    # Check for exact matches
-    for key, desc in descriptions.items():
-        if key in name.lower():
+    name_lower = name.lower()
+
+    # Exact stem match is one hash lookup and covers the common case
+    hit = _DESCRIPTIONS.get(name_lower)
+    if hit:
+        return hit
+
+    # Fall back to the substring scan, with the lowered name computed once
+    for key, desc in _DESC_ITEMS:
+        if key in name_lower:
             return desc
-    
+
     # Default: capitalize words
+    words = name.replace('_', ' ').split()
     return ' '.join(word.capitalize() for word in words)
 
-def has_file_header(content):
-    """Check if file already has @file documentation."""
+# Files known to already carry a header from a previous run, keyed by
+# path with their (mtime, size) signature; lets repeat runs skip the
+# open+read for unchanged files on the strength of a stat alone
+_CACHE_PATH = '.header_cache.json'
+_header_cache = {}
+
+def _load_header_cache():
+    """Load the known-headered file cache from a previous run."""
+    global _header_cache
+    try:
+        with open(_CACHE_PATH) as f:
+            _header_cache = json.load(f)
+    except (OSError, ValueError):
+        _header_cache = {}
+
+def _save_header_cache():
+    """Persist the known-headered file cache atomically."""
+    tmp_path = _CACHE_PATH + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(_header_cache, f)
+    os.replace(tmp_path, _CACHE_PATH)
+
+def has_file_header(raw):
+    """Check if file content (bytes) already has @file documentation."""
     # Check for @file in first 20 lines
-    lines = content.split('\n')[:20]
+    lines = raw.split(b'\n', 20)[:20]
     for line in lines:
-        if '@file' in line:
+        if b'@file' in line:
             return True
     return False
 
-def add_file_header(filepath):
+def add_file_header(filepath, ext=None):
     """Add Doxygen file header to a C++ file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Skip if already has header
-    if has_file_header(content):
+    if ext is None:
+        ext = os.path.splitext(filepath)[1]
+
+    # Unchanged since it was last seen with a header: one stat, no read
+    st = os.stat(filepath)
+    sig = [st.st_mtime, st.st_size]
+    if _header_cache.get(filepath) == sig:
         return False
-    
+
+    # A 4 KiB prefix is plenty for the first 20 lines; files that already
+    # carry a header (the common case, per the skipped counter) return
+    # after one bounded read, never touching the rest of the file
+    with open(filepath, 'rb') as f:
+        head = f.read(4096)
+        if has_file_header(head):
+            _header_cache[filepath] = sig
+            return False
+        content = head + f.read()
+
     # Get filename and description
     filename = os.path.basename(filepath)
     brief = get_brief_description(filename)
-    
+
     # Determine if it's a header or source file
-    is_header = filepath.endswith('.h') or filepath.endswith('.hpp')
+    is_header = ext in _HEADER_EXTS
     file_type = "header" if is_header else "implementation"
-    
-    # Create the header
-    header = f'''/**
- * @file {filename}
- * @brief {brief}
- * @author Neo C++ Team
- * @date {datetime.now().year}
- * @copyright MIT License
- */
 
-'''
-    
+    # Create the header. Everything inserted and every marker tested is
+    # ASCII, so the whole pipeline stays on bytes: no decode on read, no
+    # encode on write.
+    header = _HEADER_TPL.format(filename=filename, brief=brief).encode()
+
     # Handle different file starts
-    if content.startswith('#pragma once'):
+    if content.startswith(b'#pragma once'):
         # Header file with pragma once
-        content = content.replace('#pragma once', f'{header}#pragma once', 1)
-    elif content.startswith('#ifndef'):
-        # Header file with include guards
-        lines = content.split('\n')
-        # Find the #ifndef and #define lines
-        guard_lines = []
-        for i, line in enumerate(lines[:5]):
-            if line.startswith('#ifndef') or line.startswith('#define'):
-                guard_lines.append(i)
-        
-        if len(guard_lines) >= 2:
+        content = content.replace(b'#pragma once', header + b'#pragma once', 1)
+    elif content.startswith(b'#ifndef'):
+        # Header file with include guards. Walk the first five lines by
+        # index and insert with one slice-and-concat instead of splitting
+        # the whole file into a line list and re-joining it.
+        guards = 0
+        insert_at = -1
+        pos = 0
+        for _ in range(5):
+            nl = content.find(b'\n', pos)
+            end = len(content) if nl == -1 else nl + 1
+            if content.startswith((b'#ifndef', b'#define'), pos):
+                guards += 1
+                insert_at = end
+            if nl == -1:
+                break
+            pos = end
+
+        if guards >= 2:
             # Insert after the guard
-            lines.insert(guard_lines[-1] + 1, header.rstrip())
-            content = '\n'.join(lines)
+            block = header.rstrip()
+            if insert_at > 0 and content[insert_at - 1:insert_at] != b'\n':
+                block = b'\n' + block
+            if insert_at < len(content):
+                block += b'\n'
+            content = content[:insert_at] + block + content[insert_at:]
         else:
             # Just prepend
             content = header + content
-    elif content.startswith('#include'):
+    elif content.startswith(b'#include'):
         # Source file starting with includes
         content = header + content
-    elif content.startswith('//'):
-        # File starting with comments - replace them
-        lines = content.split('\n')
-        # Skip comment lines
-        i = 0
-        while i < len(lines) and (lines[i].startswith('//') or lines[i].strip() == ''):
-            i += 1
-        
+    elif content.startswith(b'//'):
+        # File starting with comments - replace them. Advance an index
+        # past the comment prefix rather than materializing every line.
+        pos = 0
+        while pos < len(content):
+            nl = content.find(b'\n', pos)
+            end = len(content) if nl == -1 else nl + 1
+            line = content[pos:end]
+            if not (line.startswith(b'//') or line.strip() == b''):
+                break
+            pos = end
+
         # Keep the rest
-        content = header + '\n'.join(lines[i:])
+        content = header + content[pos:]
     else:
         # Just prepend the header
         content = header + content
-    
+
     # Write back
-    with open(filepath, 'w', encoding='utf-8') as f:
+    with open(filepath, 'wb') as f:
         f.write(content)
-    
+
+    # The file now has a header; remember its post-write signature
+    st = os.stat(filepath)
+    _header_cache[filepath] = [st.st_mtime, st.st_size]
+
     return True
 
+def _process_one(item):
+    """Run add_file_header, capturing per-file errors for later reporting."""
+    filepath, ext = item
+    try:
+        return add_file_header(filepath, ext)
+    except Exception as e:
+        return e
+
 def process_directory(directory):
     """Process all C++ files in a directory."""
+    # Find all header and source files
+    files = list(_iter_cpp_files(directory))
+
+    # The per-file work is read-heavy and independent, so threads overlap
+    # the disk latency; reporting is deferred until after the map so
+    # output lines never interleave
+    with ThreadPoolExecutor(max_workers=(os.cpu_count() or 4) * 2) as executor:
+        results = list(executor.map(_process_one, files))
+
+    # One stdout write per directory instead of a flushing print per file
+    msgs = []
     updated = 0
     skipped = 0
-    
-    # Find all header and source files
-    for root, dirs, files in os.walk(directory):
-        # Skip third_party and build directories
-        if 'third_party' in root or 'build' in root or '.git' in root:
-            continue
-        
-        for file in files:
-            if file.endswith(('.h', '.hpp', '.cpp', '.cc')):
-                filepath = os.path.join(root, file)
-                
-                try:
-                    if add_file_header(filepath):
-                        print(f"✓ Added header to {filepath}")
-                        updated += 1
-                    else:
-                        skipped += 1
-                except Exception as e:
-                    print(f"✗ Error processing {filepath}: {e}")
-    
+    for (filepath, _ext), result in zip(files, results):
+        if isinstance(result, Exception):
+            msgs.append(f"✗ Error processing {filepath}: {result}\n")
+        elif result:
+            msgs.append(f"✓ Added header to {filepath}\n")
+            updated += 1
+        else:
+            skipped += 1
+
+    if msgs:
+        sys.stdout.write(''.join(msgs))
+
     return updated, skipped
 
 def main():
@@ -219,6 +338,8 @@ def main():
     
     print("Adding missing file headers...")
     print("")
+
+    _load_header_cache()
     
     # Process include directory
     include_updated = 0
@@ -238,6 +359,8 @@ def main():
         src_updated += u
         src_skipped += s
     
+    _save_header_cache()
+
     # Summary
     print("")
     print("=" * 40)
@@ -3,10 +3,19 @@
 Comprehensive test coverage analysis for Neo C++ vs Neo C# implementations
 """
 
+import mmap
 import os
 import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from collections import defaultdict
+
+# Compiled once at import; compiling inside the hot loops re-parsed the
+# same pattern strings for every file scanned
+_TEST_FILE_RE = re.compile(r'test_(\w+)\.cpp$')
+# Bytes pattern so files can be scanned without a UTF-8 decode pass
+_ANY_TEST_RE = re.compile(rb'\bTEST(?:_F)?\s*\(')
 
 # Neo C# expected test categories based on Neo 3.x structure
 NEO_CS_TEST_CATEGORIES = {
@@ -147,39 +156,139 @@ NEO_CS_TEST_CATEGORIES = {
     }
 }
 
+def _iter_files(root):
+    """Yield file paths under root via scandir, without per-entry stats"""
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                # d_type from readdir answers is_dir/is_file without an
+                # extra stat syscall per entry
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry.path
+
 def find_cpp_tests(base_dir):
-    """Find all C++ test files and categorize them"""
-    cpp_tests = defaultdict(list)
-    test_pattern = re.compile(r'test_(\w+)\.cpp$')
-    
-    for root, dirs, files in os.walk(os.path.join(base_dir, 'tests')):
-        for file in files:
-            if match := test_pattern.match(file):
-                category = Path(root).parts[-1]
-                cpp_tests[category].append(file)
-    
-    return cpp_tests
+    """Find all C++ test files keyed by directory relative to tests/unit"""
+    tmp = {}
+    unit_root = os.path.join(base_dir, 'tests', 'unit')
+
+    for path in _iter_files(unit_root):
+        file = os.path.basename(path)
+        if match := _TEST_FILE_RE.match(file):
+            # Keying by the full relative directory (not just the leaf
+            # name) keeps nested dirs like smartcontract/native distinct
+            # and makes the joined paths below actually resolve
+            rel_dir = os.path.relpath(os.path.dirname(path), unit_root)
+            tmp.setdefault(rel_dir.replace(os.sep, '/'), []).append(file)
 
+    # Tuples carry no append over-allocation and iterate faster; the
+    # index is only ever read after this point
+    return {cat: tuple(files) for cat, files in tmp.items()}
+
+@lru_cache(maxsize=None)
 def count_test_cases(file_path):
     """Count TEST/TEST_F macros in a C++ test file"""
     count = 0
     try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-            # Count TEST and TEST_F macros
-            count += len(re.findall(r'TEST\s*\(', content))
-            count += len(re.findall(r'TEST_F\s*\(', content))
+        # The regex runs straight over a memory map of the file: a
+        # zero-copy view into the page cache with no intermediate bytes
+        # buffer. One alternation pass counts TEST and TEST_F together.
+        with open(file_path, 'rb') as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    count = sum(1 for _ in _ANY_TEST_RE.finditer(mm))
+            except ValueError:  # empty file
+                pass
     except:
         pass
     return count
 
+# Expected category -> tests/unit subdirectories, matched most specific
+# first so every test directory lands in exactly one category
+_CATEGORY_TO_SUBDIRS = {
+    'Cryptography': ('cryptography',),
+    'IO': ('io',),
+    'Json': ('json',),
+    'Ledger': ('ledger',),
+    'Network': ('network',),
+    'SmartContract': ('smartcontract',),
+    'SmartContract.Native': ('smartcontract/native',),
+    'VM': ('vm',),
+    'Wallets': ('wallets', 'wallet'),
+    'Persistence': ('persistence',),
+    'Consensus': ('consensus',),
+    'Extensions': ('extensions',),
+    'Plugins': ('plugins',),
+    'Core': ('core',),
+}
+
+def _count_cases_bulk(paths):
+    """Count TEST/TEST_F macros for many files, preferring one rg sweep"""
+    # ripgrep runs the whole scan in one SIMD-accelerated, multithreaded
+    # process; the explicit path list keeps its output keys identical to
+    # ours. Files it omits had zero matches.
+    counts = dict.fromkeys(paths, 0)
+    if not paths:
+        return counts
+    try:
+        result = subprocess.run(
+            ['rg', '--count-matches', '--no-ignore', '-e', r'\bTEST(?:_F)?\s*\(', *paths],
+            capture_output=True,
+            text=True
+        )
+    except OSError:
+        # rg not on PATH: fall back to the in-process scanner, with
+        # threads overlapping the independent file reads
+        with ThreadPoolExecutor(max_workers=(os.cpu_count() or 4) * 2) as executor:
+            return dict(zip(paths, executor.map(count_test_cases, paths)))
+
+    for line in result.stdout.splitlines():
+        path, _, num = line.rpartition(':')
+        if path in counts:
+            counts[path] = int(num)
+    return counts
+
 def analyze_coverage(base_dir):
     """Analyze test coverage comparing to expected Neo C# tests"""
     print("Neo C++ Test Coverage Analysis")
     print("=" * 80)
     
     cpp_tests = find_cpp_tests(base_dir)
-    
+
+    # Count every discovered test file once up front; categories that
+    # fuzzy-match the same directory reuse the precomputed count instead
+    # of re-reading the file
+    all_paths = sorted({
+        os.path.join(base_dir, 'tests/unit', cat, file)
+        for cat, files in cpp_tests.items()
+        for file in files
+    })
+    case_counts = _count_cases_bulk(all_paths)
+
+    # Assign each test directory to exactly one expected category, most
+    # specific subdirectory first; the old symmetric substring match
+    # counted smartcontract/native files into both SmartContract and
+    # SmartContract.Native
+    subdir_items = sorted(
+        ((cat, subdir)
+         for cat, subdirs in _CATEGORY_TO_SUBDIRS.items()
+         for subdir in subdirs),
+        key=lambda kv: len(kv[1]),
+        reverse=True
+    )
+    dirs_by_category = {}
+    for rel_dir in cpp_tests:
+        for cat, subdir in subdir_items:
+            if rel_dir == subdir or rel_dir.startswith(subdir + '/'):
+                dirs_by_category.setdefault(cat, []).append(rel_dir)
+                break
+
     total_expected = 0
     total_actual = 0
     total_test_cases = 0
@@ -191,20 +300,15 @@ def analyze_coverage(base_dir):
         total_expected += expected_count
         
         # Find corresponding C++ tests
-        cpp_category = category.lower().replace('.', '/')
-        if 'native' in cpp_category:
-            cpp_category = 'smartcontract/native'
-        
         actual_files = []
         actual_count = 0
-        
-        # Search in multiple possible locations
-        for cat, files in cpp_tests.items():
-            if cpp_category in cat.lower() or cat.lower() in cpp_category:
-                actual_files.extend(files)
-                for file in files:
-                    file_path = os.path.join(base_dir, 'tests/unit', cat, file)
-                    actual_count += count_test_cases(file_path)
+
+        for rel_dir in dirs_by_category.get(category, ()):
+            files = cpp_tests[rel_dir]
+            actual_files.extend(files)
+            for file in files:
+                file_path = os.path.join(base_dir, 'tests/unit', rel_dir, file)
+                actual_count += case_counts[file_path]
         
         total_actual += len(actual_files)
         total_test_cases += actual_count
@@ -5,12 +5,27 @@ Neo C++ to C# Consistency Checker
 This script checks for consistency between C++ implementation and C# reference
 """
 
+import hashlib
+import json
+import mmap
 import os
 import re
+import shutil
+import subprocess
 import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Dict, List, Set, Tuple
 
+try:
+    # google-re2 executes in guaranteed linear time, so patterns like
+    # the catch-block scan cannot backtrack pathologically on odd input
+    import re2 as _regex_engine
+except ImportError:
+    _regex_engine = re
+
 # ANSI color codes
 RED = '\033[0;31m'
 GREEN = '\033[0;32m'
@@ -18,10 +33,375 @@ YELLOW = '\033[1;33m'
 BLUE = '\033[0;34m'
 NC = '\033[0m'  # No Color
 
+# Pattern, C# version, C++ version, severity. Module scope so worker
+# processes compile everything once at import instead of pickling
+# re.Pattern objects across the pool boundary.
+_PATTERN_META = [
+    (r'throw new NotImplementedException', 'NotImplementedException', 'std::runtime_error("not implemented")', 'critical'),
+    (r'Console\.WriteLine', 'Console.WriteLine', 'LOG_INFO or std::cout', 'warning'),
+    (r'Debug\.Assert', 'Debug.Assert', 'assert (should be in debug only)', 'warning'),
+    (r'using\s+\(', 'using statement', 'RAII/unique_ptr/lock_guard', 'info'),
+    (r'async\s+Task', 'async/await', 'std::future/std::async', 'info'),
+    (r'\?\?', 'null coalescing', 'value_or/optional', 'info'),
+    (r'LINQ', 'LINQ queries', 'std algorithms', 'info'),
+]
+
+# Most of the patterns are fixed strings once unescaped, and
+# str.__contains__ runs a C-level two-way search that beats the regex
+# engine for literal needles. They are matched against a lowered copy to
+# keep the case-insensitive behavior; only the two patterns with real
+# metacharacters stay in the alternation.
+_LITERAL_PATTERNS = [
+    (0, b'throw new notimplementedexception'),
+    (1, b'console.writeline'),
+    (2, b'debug.assert'),
+    (5, b'??'),
+    (6, b'linq'),
+]
+# The literal table is fixed at import, so the per-file loop over it is
+# partial-evaluated into a straight-line function: no tuple unpacking or
+# table indirection left in the hot path, just one find per needle
+_SCAN_LITERALS_SRC = 'def _scan_literals(lowered, matched):\n' + ''.join(
+    f'    if {needle!r} in lowered:\n        matched.append({idx})\n'
+    for idx, needle in _LITERAL_PATTERNS)
+_ns: Dict[str, object] = {}
+exec(_SCAN_LITERALS_SRC, _ns)
+_scan_literals = _ns['_scan_literals']
+del _ns
+
+# Plain (not named) groups and positional dispatch keep the fused
+# patterns portable between the stdlib engine and re2; compiled over
+# bytes so files are scanned without a UTF-8 decode pass
+_REGEX_INDEXES = (3, 4)
+_PATTERNS_COMBINED = _regex_engine.compile(
+    '|'.join(f'({_PATTERN_META[i][0]})' for i in _REGEX_INDEXES).encode(),
+    re.IGNORECASE)
+
+# Coarse keyword gates: most files contain none of these substrings, and
+# a memmem-style find is far cheaper than entering the regex engine at
+# all, so each fused pass runs only when its keywords appear
+_PATTERN_KEYWORDS = (b'using', b'async')
+_ERROR_KEYWORDS = (b'catch', b'assert')
+
+# Error-handling scans, fused the same way (case-sensitive, matching the
+# original searches). The catch parameter list is bounded to one line of
+# at most 200 chars — real handlers are far shorter — so the unbounded
+# [^)]* can no longer backtrack across a whole generated file when a
+# stray unmatched paren appears. The inter-token \s* runs stay unbounded
+# because a brace on the next line is legitimate style.
+_ERROR_META = [
+    (r'catch\s*\([^)\n]{0,200}\)\s*\{\s*\}', 'empty_catch', 'critical', 'Empty catch block found'),
+    (r'catch\s*\(\s*\.\.\.\s*\)', 'generic_catch', 'warning', 'Generic catch(...) found'),
+    (r'\bassert\s*\(', 'assert_in_prod', 'warning', 'assert() in production code'),
+]
+_ERRORS_COMBINED = _regex_engine.compile(
+    '|'.join(f'({pat})' for pat, *_ in _ERROR_META).encode())
+
+# Escaped-literal fallbacks for the mmap path: a memory map has no
+# lower(), so case-insensitive literal searches run as regexes there
+_LITERAL_RES = [
+    (idx, _regex_engine.compile(re.escape(needle), re.IGNORECASE))
+    for idx, needle in _LITERAL_PATTERNS
+]
+
+# Known Neo protocol constants, as bytes to match the raw file content
+_KNOWN_CONSTANTS = {
+    b'2000000': 'MaxTransactionSize',
+    b'1024': 'MaxTransactionAttributes',
+    b'16': 'MaxTransactionWitnesses',
+    b'2102': 'MaxContractLength',
+    b'255': 'MaxContractParametersCount',
+    b'1048576': 'MaxNotificationSize',
+    b'32768': 'MaxStackSize',
+}
+
+# Identifier tokens, for membership checks against whole names
+_WORD_RE = re.compile(r'[A-Za-z_]\w+')
+
+# Standalone integer literals sized to the known-constants table; token
+# matching keeps 1024 from firing inside 10240 or UInt160-style names
+_INT_RE = re.compile(rb'\b\d{2,7}\b')
+
+# CamelCase word break, for snake_case conversion
+_SNAKE_RE = re.compile(r'([a-z0-9])([A-Z])')
+
+# Files larger than this are memory-mapped rather than copied into the
+# heap; files smaller than the shortest needle cannot match anything
+_MMAP_THRESHOLD = 1 << 20
+_MIN_NEEDLE = min(
+    [len(n) for _, n in _LITERAL_PATTERNS]
+    + [len(n) for n in _KNOWN_CONSTANTS])
+
+
+# Known Neo-specific patterns. Tuples, not lists: the tables are fixed
+# read-only rule data, and tuple iteration keeps the report order
+# deterministic where a frozenset would scramble it (the membership
+# tests all run against real sets elsewhere).
+_NEO_PATTERNS = {
+    'native_contracts': (
+        'ContractManagement',
+        'StdLib',
+        'CryptoLib',
+        'LedgerContract',
+        'NeoToken',
+        'GasToken',
+        'PolicyContract',
+        'RoleManagement',
+        'OracleContract',
+    ),
+    'required_methods': {
+        'NativeContract': ('OnPersist', 'PostPersist', 'Initialize', 'OnManifestCompose'),
+        'NeoToken': ('Vote', 'GetCommittee', 'GetCandidates', 'GetNextBlockValidators'),
+        'GasToken': ('GetGasPerBlock', 'SetGasPerBlock'),
+        'PolicyContract': ('GetFeePerByte', 'GetExecFeeFactor', 'SetFeePerByte'),
+        'RoleManagement': ('DesignateAsRole', 'GetDesignatedByRole'),
+    },
+    'consensus_states': (
+        'Primary',
+        'Backup',
+        'RequestSent',
+        'RequestReceived',
+        'SignatureSent',
+        'BlockSent',
+        'ViewChanging',
+    )
+}
+
+# Snake-case forms of the fixed contract set, computed once at import
+# instead of running the regex per loop iteration
+_SNAKE_NAMES = {
+    c: _SNAKE_RE.sub(r'\1_\2', c).lower()
+    for c in _NEO_PATTERNS['native_contracts']}
+
+# One pattern per required method, compiled once. The unanchored
+# Name\s*\( form subsumes the ::-qualified and word-boundary variants
+# (a \b would miss OnSetFeePerByte-style handlers that the original
+# scan accepted)
+_METHOD_PATTERNS = {
+    m: re.compile(re.escape(m) + r'\s*\(')
+    for cls_methods in _NEO_PATTERNS['required_methods'].values()
+    for m in cls_methods}
+
+# Per-file scan results from earlier runs, keyed by path with an
+# (mtime_ns, size) signature; on dev-loop reruns only touched files pay
+# the read + scan. The rules digest invalidates everything whenever the
+# pattern tables change.
+_CACHE_PATH = Path(__file__).with_name('.consistency_cache.json')
+_RULES_KEY = hashlib.sha1(repr((
+    [p for p, *_ in _PATTERN_META],
+    [p for p, *_ in _ERROR_META],
+    sorted(_KNOWN_CONSTANTS),
+    _INT_RE.pattern,
+)).encode()).hexdigest()
+
+
+# Directories never worth descending into; pruned at the parent so the
+# walk skips the whole subtree instead of filtering paths after the fact
+_EXCLUDED_DIRS = frozenset(
+    ('build', '.git', 'third_party', 'tests', 'test', 'cmake-build-debug'))
+
+
+def _iter_cpp(root: str):
+    """Yield .cpp paths under root with one scandir pass per directory"""
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                # d_type from readdir answers is_dir without an extra
+                # stat syscall per entry
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _EXCLUDED_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith('.cpp'):
+                    yield entry.path
+
+
+def _dir_entries(path) -> Set[str]:
+    """Entry names of one directory via a single scandir, empty if missing"""
+    try:
+        with os.scandir(path) as it:
+            return {e.name for e in it}
+    except OSError:
+        return set()
+
+
+def _view(path: str) -> mmap.mmap:
+    """Map a file read-only; pages fault in as the scans touch them."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
+
+
+def _scan_errors(content, rel: str) -> List[tuple]:
+    """First occurrence of each fused error pattern, in match order.
+
+    The alternation consumes each region once, so an empty catch(...)
+    block reports only as empty_catch, never doubly as generic_catch.
+    """
+    issues = []
+    eseen = set()
+    for m in _ERRORS_COMBINED.finditer(content):
+        for gi, val in enumerate(m.groups()):
+            if val is not None:
+                idx = gi
+                break
+        if idx in eseen:
+            continue
+        eseen.add(idx)
+        _, _key, severity, message = _ERROR_META[idx]
+        issues.append((severity, rel, message))
+        if len(eseen) == len(_ERROR_META):
+            break
+    return issues
+
+
+def _scan_file(root: str, path: str):
+    """Run every per-file pattern scan over one source file.
+
+    Top-level and argument-picklable so ProcessPoolExecutor workers can
+    run it; returns (matched pattern indexes, error issues, magic-number
+    issues) for the orchestrating process to aggregate.
+    """
+    # Raw bytes: every needle and pattern here is ASCII, so scanning the
+    # undecoded content skips a UTF-8 decode pass per file. Large
+    # (typically generated) files are memory-mapped instead of copied
+    # into the heap; the byte-mode regexes run straight over the map.
+    try:
+        size = os.stat(path).st_size
+    except OSError:
+        return [], [], []
+    if size < _MIN_NEEDLE:
+        return [], [], []
+
+    mm = None
+    try:
+        if size > _MMAP_THRESHOLD:
+            mm = _view(path)
+            content = mm
+        else:
+            content = Path(path).read_bytes()
+    except (OSError, ValueError):
+        return [], [], []
+
+    rel = os.path.relpath(path, root)
+
+    # Common C# patterns: literal needles on one lowered copy, the rest
+    # in a single finditer pass; each pattern recorded at most once
+    matched = []
+    if mm is None:
+        lowered = content.lower()
+        _scan_literals(lowered, matched)
+    else:
+        for idx, pattern in _LITERAL_RES:
+            if pattern.search(content):
+                matched.append(idx)
+
+    # The mmap path has no lowered copy, so its case-insensitive gate is
+    # skipped and the pass runs unconditionally
+    if mm is not None or any(kw in lowered for kw in _PATTERN_KEYWORDS):
+        seen = set()
+        for m in _PATTERNS_COMBINED.finditer(content):
+            for gi, val in enumerate(m.groups()):
+                if val is not None:
+                    idx = _REGEX_INDEXES[gi]
+                    break
+            if idx not in seen:
+                seen.add(idx)
+                matched.append(idx)
+                if len(seen) == len(_REGEX_INDEXES):
+                    break
+
+    if any(content.find(kw) != -1 for kw in _ERROR_KEYWORDS):
+        error_issues = _scan_errors(content, rel)
+    else:
+        error_issues = []
+
+    # One tokenization pass and O(1) set lookups per constant, instead
+    # of a linear substring scan per (number, name) pair; find() rather
+    # than `in` for the name check so the same code serves bytes and mmap
+    nums = set(_INT_RE.findall(content))
+    magic_issues = [
+        ('warning', rel, f"Magic number {number.decode()} should be {constant_name}")
+        for number, constant_name in _KNOWN_CONSTANTS.items()
+        if number in nums and content.find(constant_name.encode()) == -1
+    ]
+
+    if mm is not None:
+        mm.close()
+    return matched, error_issues, magic_issues
+
+
+def _scan_with_rg(root: str, paths: List[str]) -> Dict[str, tuple]:
+    """Resolve per-file scan results by delegating the scans to ripgrep.
+
+    The patterns are written to be valid in both engines (escaped braces,
+    no backreferences), so rg's SIMD literal search and Aho-Corasick
+    prefilters do the heavy lifting instead of the Python regex VM.
+    ripgrep's JSON events do not say which -e pattern matched, so each
+    rule runs as its own files-with-matches query over the explicit path
+    list; raises OSError if rg cannot be executed so the caller can fall
+    back to the in-process scanner.
+    """
+    def files_matching(pattern: str, *flags: str) -> Set[str]:
+        proc = subprocess.run(
+            ['rg', '-l', '--no-config', *flags, '-e', pattern, '--', *paths],
+            capture_output=True, text=True)
+        return set(proc.stdout.splitlines())
+
+    matched: Dict[str, List[int]] = {p: [] for p in paths}
+    errors: Dict[str, List[tuple]] = {p: [] for p in paths}
+    magics: Dict[str, List[tuple]] = {p: [] for p in paths}
+
+    for idx, (pattern, *_rest) in enumerate(_PATTERN_META):
+        for p in files_matching(pattern, '-i'):
+            matched[p].append(idx)
+
+    # rg narrows the error scan to candidate files; the fused in-process
+    # pass then keeps its exact consume-once semantics (an empty
+    # catch(...) block must not double-report as generic_catch)
+    candidates = files_matching(
+        '|'.join(f'(?:{pat})' for pat, *_ in _ERROR_META))
+    for p in candidates:
+        try:
+            content = Path(p).read_bytes()
+        except OSError:
+            continue
+        errors[p] = _scan_errors(content, os.path.relpath(p, root))
+
+    for number, name in _KNOWN_CONSTANTS.items():
+        with_number = files_matching(rf'\b{number.decode()}\b')
+        with_name = files_matching(re.escape(name))
+        for p in with_number - with_name:
+            magics[p].append((
+                'warning', os.path.relpath(p, root),
+                f"Magic number {number.decode()} should be {name}"))
+
+    return {p: (matched[p], errors[p], magics[p]) for p in paths}
+
+
 class ConsistencyChecker:
     def __init__(self, cpp_root: str):
         self.cpp_root = Path(cpp_root)
-        self.issues: List[Tuple[str, str, str]] = []  # (severity, file, message)
+        # Issues bucketed by (severity, file) at append time, so the
+        # report never regroups, with a seen-set dropping exact repeats
+        self.issues: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+        self._issue_seen: Set[Tuple[str, str, str]] = set()
+
+        # Non-test .cpp paths collected by one tree walk; the per-file
+        # scans run in worker processes and their aggregated results land
+        # here for the checker methods to report. The mtime-keyed text
+        # cache serves the in-process readers across repeat run() calls.
+        self._cpp_files: List[Path] = []
+        self._text_cache: Dict[Path, Tuple[int, str]] = {}
+        self._pattern_hits: Dict[int, List[Path]] = {}
+        self._error_issues: List[Tuple[str, str, str]] = []
+        self._magic_issues: List[Tuple[str, str, str]] = []
         
         # Known C# to C++ mappings
         self.type_mappings = {
@@ -45,37 +425,108 @@ class ConsistencyChecker:
             'GetHashCode': 'GetHash',
         }
         
-        # Known Neo-specific patterns
-        self.neo_patterns = {
-            'native_contracts': [
-                'ContractManagement',
-                'StdLib',
-                'CryptoLib',
-                'LedgerContract',
-                'NeoToken',
-                'GasToken',
-                'PolicyContract',
-                'RoleManagement',
-                'OracleContract',
-            ],
-            'required_methods': {
-                'NativeContract': ['OnPersist', 'PostPersist', 'Initialize', 'OnManifestCompose'],
-                'NeoToken': ['Vote', 'GetCommittee', 'GetCandidates', 'GetNextBlockValidators'],
-                'GasToken': ['GetGasPerBlock', 'SetGasPerBlock'],
-                'PolicyContract': ['GetFeePerByte', 'GetExecFeeFactor', 'SetFeePerByte'],
-                'RoleManagement': ['DesignateAsRole', 'GetDesignatedByRole'],
-            },
-            'consensus_states': [
-                'Primary',
-                'Backup',
-                'RequestSent',
-                'RequestReceived',
-                'SignatureSent',
-                'BlockSent',
-                'ViewChanging',
-            ]
-        }
+        # Fixed rule data and its derived patterns live at module scope
+        # and are compiled exactly once at import; the instance just
+        # aliases them so call sites read naturally
+        self.neo_patterns = _NEO_PATTERNS
+        self._snake = _SNAKE_NAMES
+        self._method_patterns = _METHOD_PATTERNS
+
     
+    def _load_cpp_sources(self):
+        """Collect every non-test .cpp path with a single tree walk"""
+        # The dir-level pruning does the heavy lifting; the substring
+        # filter keeps parity with the old rglob for paths that merely
+        # contain 'test' outside a pruned directory. Sorted so report
+        # order does not depend on readdir order.
+        self._cpp_files = sorted(
+            Path(p) for p in _iter_cpp(str(self.cpp_root)) if 'test' not in p)
+
+    def _read_source(self, path: Path) -> str:
+        """Read one source file through the mtime-keyed text cache"""
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            return ''
+        cached = self._text_cache.get(path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        try:
+            text = path.read_text(errors='replace')
+        except OSError:
+            return ''
+        self._text_cache[path] = (mtime_ns, text)
+        return text
+
+    def _scan_sources(self):
+        """Fan the per-file pattern scans out across worker processes"""
+        # Replay cached results for files whose (mtime_ns, size) is
+        # unchanged since the last run; only the rest hit the pool
+        try:
+            cache = json.loads(_CACHE_PATH.read_text())
+        except (OSError, ValueError):
+            cache = {}
+        if cache.get('rules') != _RULES_KEY:
+            cache = {'rules': _RULES_KEY}
+
+        results_by_path = {}
+        to_scan = []
+        sigs = {}
+        for p in self._cpp_files:
+            key = str(p)
+            try:
+                st = os.stat(key)
+            except OSError:
+                to_scan.append(key)
+                continue
+            sigs[key] = (st.st_mtime_ns, st.st_size)
+            entry = cache.get(key)
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                results_by_path[key] = entry[2:]
+            else:
+                to_scan.append(key)
+
+        if to_scan:
+            # ripgrep, when installed, scans the whole batch with SIMD
+            # literal search; otherwise each file is independent and the
+            # regex work is CPU-bound, so the process pool scales with
+            # cores and only path strings and small result tuples cross
+            # the pickle boundary
+            new_results = None
+            if shutil.which('rg'):
+                try:
+                    new_results = _scan_with_rg(str(self.cpp_root), to_scan)
+                except OSError:
+                    new_results = None
+            if new_results is None:
+                scan = partial(_scan_file, str(self.cpp_root))
+                with ProcessPoolExecutor() as executor:
+                    new_results = dict(zip(
+                        to_scan, executor.map(scan, to_scan, chunksize=32)))
+
+            for key, result in new_results.items():
+                results_by_path[key] = result
+                sig = sigs.get(key)
+                if sig:
+                    cache[key] = [*sig, *result]
+
+            # Atomic replace so an interrupted run never leaves a
+            # truncated cache behind
+            tmp_path = _CACHE_PATH.with_suffix('.json.tmp')
+            tmp_path.write_text(json.dumps(cache))
+            os.replace(tmp_path, _CACHE_PATH)
+
+        self._pattern_hits = {}
+        self._error_issues = []
+        self._magic_issues = []
+        for path in self._cpp_files:
+            matched, error_issues, magic_issues = results_by_path[str(path)]
+            for idx in matched:
+                self._pattern_hits.setdefault(idx, []).append(path)
+            # Replayed entries come back from JSON as lists
+            self._error_issues.extend(tuple(i) for i in error_issues)
+            self._magic_issues.extend(tuple(i) for i in magic_issues)
+
     def check_file_structure(self):
         """Check if C++ project has similar structure to C# Neo"""
         print(f"\n{YELLOW}Checking project structure...{NC}")
@@ -92,10 +543,16 @@ class ConsistencyChecker:
             'src/vm',
         ]
         
+        # One scandir per distinct parent answers every exists() below
+        # from a name set instead of a stat syscall per directory
+        listed: Dict[str, Set[str]] = {}
         for dir_path in required_dirs:
-            full_path = self.cpp_root / dir_path
-            if not full_path.exists():
-                self.issues.append(('warning', dir_path, f"Missing directory (exists in C# Neo)"))
+            parent, _, name = dir_path.rpartition('/')
+            names = listed.get(parent)
+            if names is None:
+                names = listed[parent] = _dir_entries(self.cpp_root / parent)
+            if name not in names:
+                self._add_issue('warning', dir_path, f"Missing directory (exists in C# Neo)")
             else:
                 print(f"{GREEN}✓{NC} {dir_path}")
     
@@ -105,20 +562,26 @@ class ConsistencyChecker:
         
         native_dir = self.cpp_root / 'src/smartcontract/native'
         if not native_dir.exists():
-            self.issues.append(('critical', 'native contracts', "Native contracts directory missing"))
+            self._add_issue('critical', 'native contracts', "Native contracts directory missing")
             return
         
+        # Two scandirs replace two stats per contract
+        native_headers = _dir_entries(
+            self.cpp_root / 'include/neo/smartcontract/native')
+        native_cpps = _dir_entries(native_dir)
+
         for contract in self.neo_patterns['native_contracts']:
-            # Check header file
-            header_file = self.cpp_root / f'include/neo/smartcontract/native/{self._to_snake_case(contract)}.h'
-            cpp_file = native_dir / f'{self._to_snake_case(contract)}.cpp'
-            
-            if not header_file.exists() and not cpp_file.exists():
-                self.issues.append(('critical', contract, f"Native contract not implemented"))
+            snake = self._snake[contract]
+            has_cpp = f'{snake}.cpp' in native_cpps
+
+            if f'{snake}.h' not in native_headers and not has_cpp:
+                self._add_issue('critical', contract, f"Native contract not implemented")
             else:
                 # Check required methods
-                if contract in self.neo_patterns['required_methods']:
-                    self._check_required_methods(cpp_file, contract, self.neo_patterns['required_methods'][contract])
+                if has_cpp and contract in self.neo_patterns['required_methods']:
+                    self._check_required_methods(
+                        native_dir / f'{snake}.cpp', contract,
+                        self.neo_patterns['required_methods'][contract])
                 print(f"{GREEN}✓{NC} {contract}")
     
     def check_cryptography_implementations(self):
@@ -137,12 +600,12 @@ class ConsistencyChecker:
         for file_path, required_items in crypto_checks.items():
             full_path = self.cpp_root / file_path
             if not full_path.exists():
-                self.issues.append(('critical', file_path, "Missing cryptography implementation"))
+                self._add_issue('critical', file_path, "Missing cryptography implementation")
             else:
                 content = full_path.read_text()
                 for item in required_items:
                     if item not in content:
-                        self.issues.append(('warning', file_path, f"Missing {item} implementation"))
+                        self._add_issue('warning', file_path, f"Missing {item} implementation")
                 print(f"{GREEN}✓{NC} {Path(file_path).name}")
     
     def check_consensus_implementation(self):
@@ -151,7 +614,7 @@ class ConsistencyChecker:
         
         consensus_dir = self.cpp_root / 'src/consensus'
         if not consensus_dir.exists():
-            self.issues.append(('critical', 'consensus', "Consensus directory missing"))
+            self._add_issue('critical', 'consensus', "Consensus directory missing")
             return
         
         # Check for dBFT implementation files
@@ -166,17 +629,22 @@ class ConsistencyChecker:
             'change_view.cpp',
         ]
         
+        present = _dir_entries(consensus_dir)
         for file_name in required_files:
-            if not (consensus_dir / file_name).exists():
-                self.issues.append(('critical', f'consensus/{file_name}', "dBFT component missing"))
-        
-        # Check consensus states
-        consensus_files = list(consensus_dir.glob('*.cpp'))
-        all_content = '\n'.join(f.read_text() for f in consensus_files if f.exists())
-        
+            if file_name not in present:
+                self._add_issue('critical', f'consensus/{file_name}', "dBFT component missing")
+        
+        # Check consensus states against one identifier set: tokenize
+        # each cached source once instead of scanning a concatenation of
+        # every file per state, and never build the giant joined string
+        words: Set[str] = set()
+        for path in self._cpp_files:
+            if path.parent == consensus_dir:
+                words.update(_WORD_RE.findall(self._read_source(path)))
+
         for state in self.neo_patterns['consensus_states']:
-            if state not in all_content:
-                self.issues.append(('warning', 'consensus', f"Missing consensus state: {state}"))
+            if state not in words:
+                self._add_issue('warning', 'consensus', f"Missing consensus state: {state}")
     
     def check_vm_implementation(self):
         """Check VM implementation completeness"""
@@ -184,7 +652,7 @@ class ConsistencyChecker:
         
         vm_dir = self.cpp_root / 'src/vm'
         if not vm_dir.exists():
-            self.issues.append(('critical', 'vm', "VM directory missing"))
+            self._add_issue('critical', 'vm', "VM directory missing")
             return
         
         # Check for essential VM components
@@ -199,188 +667,122 @@ class ConsistencyChecker:
         for file_name, required_items in vm_components.items():
             file_path = vm_dir / file_name
             if not file_path.exists():
-                self.issues.append(('critical', f'vm/{file_name}', "VM component missing"))
+                self._add_issue('critical', f'vm/{file_name}', "VM component missing")
             else:
                 content = file_path.read_text()
                 for item in required_items:
                     if item not in content:
-                        self.issues.append(('warning', f'vm/{file_name}', f"Missing {item}"))\
+                        self._add_issue('warning', f'vm/{file_name}', f"Missing {item}")\
 
     def check_common_patterns(self):
         """Check for common C# patterns and their C++ equivalents"""
         print(f"\n{YELLOW}Checking common patterns...{NC}")
         
-        patterns_to_check = [
-            # Pattern, C# version, C++ version, severity
-            (r'throw new NotImplementedException', 'NotImplementedException', 'std::runtime_error("not implemented")', 'critical'),
-            (r'Console\.WriteLine', 'Console.WriteLine', 'LOG_INFO or std::cout', 'warning'),
-            (r'Debug\.Assert', 'Debug.Assert', 'assert (should be in debug only)', 'warning'),
-            (r'using\s+\(', 'using statement', 'RAII/unique_ptr/lock_guard', 'info'),
-            (r'async\s+Task', 'async/await', 'std::future/std::async', 'info'),
-            (r'\?\?', 'null coalescing', 'value_or/optional', 'info'),
-            (r'LINQ', 'LINQ queries', 'std algorithms', 'info'),
-        ]
-        
-        cpp_files = list(self.cpp_root.rglob('*.cpp'))
-        
-        for pattern, csharp_feature, cpp_equivalent, severity in patterns_to_check:
-            files_with_pattern = []
-            for file_path in cpp_files:
-                if 'test' not in str(file_path):
-                    content = file_path.read_text()
-                    if re.search(pattern, content, re.IGNORECASE):
-                        files_with_pattern.append(file_path)
-            
-            if files_with_pattern:
-                for f in files_with_pattern[:3]:  # Show first 3 examples
-                    self.issues.append((severity, str(f.relative_to(self.cpp_root)), 
-                                      f"Uses {csharp_feature} pattern - should use {cpp_equivalent}"))
+        for idx, (_, csharp_feature, cpp_equivalent, severity) in enumerate(_PATTERN_META):
+            for f in self._pattern_hits.get(idx, [])[:3]:  # Show first 3 examples
+                self._add_issue(severity, str(f.relative_to(self.cpp_root)),
+                                f"Uses {csharp_feature} pattern - should use {cpp_equivalent}")
     
     def check_error_handling(self):
         """Check error handling consistency"""
         print(f"\n{YELLOW}Checking error handling patterns...{NC}")
         
-        cpp_files = list(self.cpp_root.rglob('*.cpp'))
-        
-        issues_found = {
-            'empty_catch': 0,
-            'generic_catch': 0,
-            'no_error_msg': 0,
-            'assert_in_prod': 0,
-        }
-        
-        for file_path in cpp_files:
-            if 'test' not in str(file_path):
-                content = file_path.read_text()
-                
-                # Check for empty catch blocks
-                if re.search(r'catch\s*\([^)]*\)\s*{\s*}', content):
-                    issues_found['empty_catch'] += 1
-                    self.issues.append(('critical', str(file_path.relative_to(self.cpp_root)), 
-                                      "Empty catch block found"))
-                
-                # Check for catching ...
-                if re.search(r'catch\s*\(\s*\.\.\.\s*\)', content):
-                    issues_found['generic_catch'] += 1
-                    self.issues.append(('warning', str(file_path.relative_to(self.cpp_root)), 
-                                      "Generic catch(...) found"))
-                
-                # Check for assert in non-test code
-                if re.search(r'\bassert\s*\(', content):
-                    issues_found['assert_in_prod'] += 1
-                    self.issues.append(('warning', str(file_path.relative_to(self.cpp_root)), 
-                                      "assert() in production code"))
+        for severity, file, msg in self._error_issues:
+            self._add_issue(severity, file, msg)
     
     def check_magic_numbers(self):
         """Check for magic numbers that should be constants"""
         print(f"\n{YELLOW}Checking for magic numbers...{NC}")
-        
-        # Known Neo protocol constants
-        known_constants = {
-            '2000000': 'MaxTransactionSize',
-            '1024': 'MaxTransactionAttributes', 
-            '16': 'MaxTransactionWitnesses',
-            '2102': 'MaxContractLength',
-            '255': 'MaxContractParametersCount',
-            '1048576': 'MaxNotificationSize',
-            '32768': 'MaxStackSize',
-        }
-        
-        cpp_files = list(self.cpp_root.rglob('*.cpp'))
-        
-        for file_path in cpp_files:
-            if 'test' not in str(file_path):
-                content = file_path.read_text()
-                
-                for number, constant_name in known_constants.items():
-                    if number in content and constant_name not in content:
-                        self.issues.append(('warning', str(file_path.relative_to(self.cpp_root)), 
-                                          f"Magic number {number} should be {constant_name}"))
+
+        for severity, file, msg in self._magic_issues:
+            self._add_issue(severity, file, msg)
     
     def _check_required_methods(self, file_path: Path, class_name: str, methods: List[str]):
         """Check if required methods are implemented in a class"""
-        if not file_path.exists():
-            return
-            
-        content = file_path.read_text()
+        # The caller has already established existence from its scandir
+        # name set, so no per-file stat is repeated here
+        # Served from the mtime-keyed cache, so repeat checks against
+        # the same contract file never re-read it
+        content = self._read_source(file_path)
         for method in methods:
-            # Check various C++ method patterns
-            patterns = [
-                f'{method}\\s*\\(',  # MethodName(
-                f'::{method}\\s*\\(',  # ::MethodName(
-                f'\\b{method}\\s*\\(',  # word boundary MethodName(
-            ]
-            
-            found = False
-            for pattern in patterns:
-                if re.search(pattern, content):
-                    found = True
-                    break
-            
-            if not found:
-                self.issues.append(('critical', str(file_path.relative_to(self.cpp_root)), 
-                                  f"Missing required method: {method}"))
+            if not self._method_patterns[method].search(content):
+                self._add_issue('critical', str(file_path.relative_to(self.cpp_root)),
+                                f"Missing required method: {method}")
     
-    def _to_snake_case(self, name: str) -> str:
+    def _add_issue(self, severity: str, file: str, message: str):
+        """Record one issue, dropping exact (severity, file, message) repeats"""
+        key = (severity, file, message)
+        if key not in self._issue_seen:
+            self._issue_seen.add(key)
+            self.issues[(severity, file)].append(message)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _to_snake_case(name: str) -> str:
         """Convert CamelCase to snake_case"""
-        return re.sub('([a-z0-9])([A-Z])', r'\1_\2', name).lower()
+        return _SNAKE_RE.sub(r'\1_\2', name).lower()
     
     def generate_report(self):
         """Generate final report"""
-        print(f"\n{BLUE}{'='*50}{NC}")
-        print(f"{BLUE}Consistency Check Summary{NC}")
-        print(f"{BLUE}{'='*50}{NC}")
-        
-        critical_count = len([i for i in self.issues if i[0] == 'critical'])
-        warning_count = len([i for i in self.issues if i[0] == 'warning'])
-        info_count = len([i for i in self.issues if i[0] == 'info'])
-        
-        print(f"\nTotal issues: {len(self.issues)}")
-        print(f"{RED}Critical: {critical_count}{NC}")
-        print(f"{YELLOW}Warnings: {warning_count}{NC}")
-        print(f"{BLUE}Info: {info_count}{NC}")
-        
+        # Built into one buffer and written with a single stdout call at
+        # the end, instead of a lock-and-flush print per line
+        out: List[str] = []
+        out.append(f"\n{BLUE}{'='*50}{NC}")
+        out.append(f"{BLUE}Consistency Check Summary{NC}")
+        out.append(f"{BLUE}{'='*50}{NC}")
+
+        # The buckets are already grouped by (severity, file); one pass
+        # splits them per severity and tallies message counts
+        counts: Counter = Counter()
+        grouped: Dict[str, List[Tuple[str, List[str]]]] = {
+            severity: [] for severity in ('critical', 'warning', 'info')}
+        for (severity, file), messages in self.issues.items():
+            counts[severity] += len(messages)
+            grouped[severity].append((file, messages))
+
+        out.append(f"\nTotal issues: {sum(counts.values())}")
+        out.append(f"{RED}Critical: {counts['critical']}{NC}")
+        out.append(f"{YELLOW}Warnings: {counts['warning']}{NC}")
+        out.append(f"{BLUE}Info: {counts['info']}{NC}")
+
         if self.issues:
-            print(f"\n{YELLOW}Issues found:{NC}")
-            
-            # Group by severity
+            out.append(f"\n{YELLOW}Issues found:{NC}")
+
             for severity in ['critical', 'warning', 'info']:
-                severity_issues = [i for i in self.issues if i[0] == severity]
-                if severity_issues:
+                if counts[severity]:
                     color = RED if severity == 'critical' else YELLOW if severity == 'warning' else BLUE
-                    print(f"\n{color}{severity.upper()} ({len(severity_issues)}):{NC}")
-                    
-                    # Group by file
-                    file_issues = {}
-                    for _, file, msg in severity_issues:
-                        if file not in file_issues:
-                            file_issues[file] = []
-                        file_issues[file].append(msg)
-                    
-                    for file, messages in list(file_issues.items())[:10]:  # Show first 10 files
-                        print(f"  {file}:")
+                    out.append(f"\n{color}{severity.upper()} ({counts[severity]}):{NC}")
+
+                    for file, messages in grouped[severity][:10]:  # Show first 10 files
+                        out.append(f"  {file}:")
                         for msg in messages[:3]:  # Show first 3 issues per file
-                            print(f"    - {msg}")
+                            out.append(f"    - {msg}")
                         if len(messages) > 3:
-                            print(f"    ... and {len(messages) - 3} more issues")
-        
-        print(f"\n{BLUE}{'='*50}{NC}")
-        
-        if critical_count > 0:
-            print(f"{RED}❌ Critical consistency issues found!{NC}")
-            return 1
-        elif warning_count > 0:
-            print(f"{YELLOW}⚠️  Some consistency warnings found{NC}")
-            return 0
+                            out.append(f"    ... and {len(messages) - 3} more issues")
+
+        out.append(f"\n{BLUE}{'='*50}{NC}")
+
+        if counts['critical'] > 0:
+            out.append(f"{RED}❌ Critical consistency issues found!{NC}")
+            rc = 1
+        elif counts['warning'] > 0:
+            out.append(f"{YELLOW}⚠️  Some consistency warnings found{NC}")
+            rc = 0
         else:
-            print(f"{GREEN}✅ C++ implementation is consistent with C# reference!{NC}")
-            return 0
+            out.append(f"{GREEN}✅ C++ implementation is consistent with C# reference!{NC}")
+            rc = 0
+
+        sys.stdout.write('\n'.join(out) + '\n')
+        return rc
     
     def run(self):
         """Run all consistency checks"""
         print(f"{BLUE}Neo C++ to C# Consistency Checker{NC}")
         print(f"Checking: {self.cpp_root}")
         
+        self._load_cpp_sources()
+        self._scan_sources()
+
         self.check_file_structure()
         self.check_native_contracts()
         self.check_cryptography_implementations()
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+
+"""
+Duplicate Implementation Checker for Neo C++
+Finds suffix-variant source files (_old, _backup, _v2, ...), rates how
+similar their contents are, and reports functions and classes that are
+implemented in more than one file or left out of the CMake build.
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+try:
+    # google-re2 runs the extraction patterns in guaranteed linear time,
+    # so a pathological source file cannot make the scan backtrack
+    import re2 as _regex_engine
+except ImportError:
+    _regex_engine = re
+
+try:
+    # orjson serializes the report dict in C; the stdlib json encoder
+    # walks it in Python and is the slow path only when orjson is absent
+    import orjson
+except ImportError:
+    orjson = None
+
+# Extraction patterns, compiled once at import through whichever engine
+# is available instead of per call. All patterns are bytes: every
+# downstream check is ASCII matching, so files are scanned as raw bytes
+# and never pay a UTF-8 decode; only the matched names are decoded.
+_FUNC_RE = _regex_engine.compile(
+    rb'^\s*(?:[\w:<>~&*]+\s+)+(\w+)\s*\([^)]*\)\s*'
+    rb'(?:const\s*)?(?:override\s*)?[{;]',
+    re.MULTILINE)
+_CLASS_RE = _regex_engine.compile(
+    rb'^\s*(?:class|struct)\s+(\w+)', re.MULTILINE)
+
+# Both comment forms in one alternation: a single sub pass per file
+# instead of one pass per form. DOTALL only affects the dot inside the
+# block-comment branch; the line-comment branch excludes newlines itself.
+_COMMENT_RE = _regex_engine.compile(rb'//[^\n]*|/\*.*?\*/', re.DOTALL)
+
+# Files at or above this size are memory-mapped rather than read whole,
+# so the regex passes scan the page cache directly with no heap copy
+_MMAP_THRESHOLD = 1 << 20
+
+
+def _view(path: str) -> mmap.mmap:
+    """Read-only memory map of one file; fd is closed after mapping"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
+
+
+def _strip_comments(content: bytes) -> bytes:
+    """Strip // and /* */ comments; module level so workers can run it"""
+    return _COMMENT_RE.sub(b'', content)
+
+
+def _tokenize(content: bytes) -> Set[int]:
+    """Hashed comment-stripped whitespace tokens of one file.
+
+    bytes.split with no argument is CPython's C-level whitespace
+    scanner, so no regex pass is spent on whitespace handling. Each
+    token is folded to its 64-bit builtin hash, so the pair
+    comparisons intersect sets of machine-word ints instead of byte
+    strings — no per-token string rehash or memcmp, and far less
+    resident memory. Jaccard over the hashes equals Jaccard over the
+    tokens up to negligible 64-bit collisions.
+    """
+    return set(map(hash, _strip_comments(content).split()))
+
+
+def _extract_one(path: str) -> Tuple[List[str], List[str]]:
+    """Extract function and class names from one file.
+
+    Top-level and argument-picklable so ProcessPoolExecutor workers can
+    run it; the worker reads the file itself so only the path and the
+    small name lists cross the pickle boundary.
+    """
+    mm = None
+    try:
+        if os.stat(path).st_size >= _MMAP_THRESHOLD:
+            content = mm = _view(path)
+        else:
+            content = Path(path).read_bytes()
+    except (OSError, ValueError):
+        return [], []
+    try:
+        cleaned = _strip_comments(content)
+    finally:
+        if mm is not None:
+            mm.close()
+    return (sorted({m.decode() for m in _FUNC_RE.findall(cleaned)}),
+            sorted({m.decode() for m in _CLASS_RE.findall(cleaned)}))
+
+
+# Line-classifying patterns. The whitespace classes deliberately leave
+# out \n so a run of blank lines counts one match per line, not one per
+# run. Compiled through plain re: the counts lean on its empty-match
+# advancement rules, which re2 does not guarantee to reproduce.
+_BLANK_LINE_RE = re.compile(rb'(?m)^[ \t\r\f\v]*$')
+_COMMENT_LINE_RE = re.compile(rb'(?m)^[ \t\r\f\v]*//')
+
+
+def _count_lines(content: bytes) -> Tuple[int, int]:
+    """(total, code) line counts of one file.
+
+    bytes.count and two findall passes run as C loops, replacing a
+    Python loop that stripped and classified every line individually.
+    """
+    if not content:
+        return 0, 0
+    total = content.count(b'\n')
+    if not content.endswith(b'\n'):
+        total += 1
+    blanks = len(_BLANK_LINE_RE.findall(content))
+    if content.endswith(b'\n'):
+        # ^$ also makes one zero-width match at end-of-string after the
+        # trailing newline; that position is not a line
+        blanks -= 1
+    comments = len(_COMMENT_LINE_RE.findall(content))
+    return total, total - blanks - comments
+
+
+# Path-like source tokens inside CMake files, for the inverted index
+_CMAKE_TOKEN_RE = _regex_engine.compile(r'[\w/.\-]+\.(?:cpp|h|hpp)')
+
+# Suffixes that usually mark a variant copy of a base implementation
+VARIANT_SUFFIXES = (
+    '_old', '_new', '_backup', '_copy', '_fixed', '_complete', '_v2')
+
+# Variant pairs at or above this Jaccard similarity are reported
+SIMILARITY_THRESHOLD = 0.5
+
+
+class DuplicateChecker:
+    """Find variant file groups and rate their content similarity."""
+
+    def __init__(self, project_root: str = '.'):
+        self.project_root = Path(project_root)
+        self.src_dir = self.project_root / 'src'
+        self.include_dir = self.project_root / 'include'
+        # Raw file contents, read at most once per run, and the derived
+        # comment-stripped token sets the pair comparisons work on
+        self._content_cache: Dict[Path, bytes] = {}
+        self._token_cache: Dict[Path, Set[int]] = {}
+        self._digest_cache: Dict[Path, bytes] = {}
+        # Token vocabulary interned across compared files (token hash ->
+        # bit index) and the per-file bitmask built over it
+        self._vocab: Dict[int, int] = {}
+        self._bitset_cache: Dict[Path, int] = {}
+
+    def _read(self, path: Path) -> bytes:
+        """Read one source file (raw bytes) through the per-run cache"""
+        cached = self._content_cache.get(path)
+        if cached is None:
+            try:
+                cached = path.read_bytes()
+            except OSError:
+                cached = b''
+            self._content_cache[path] = cached
+        return cached
+
+    def _token_set(self, path: Path) -> Set[int]:
+        """Hashed token set of one file, computed once"""
+        cached = self._token_cache.get(path)
+        if cached is None:
+            cached = _tokenize(self._read(path))
+            self._token_cache[path] = cached
+        return cached
+
+    def _digest(self, path: Path) -> bytes:
+        """Content digest of one file, computed once per run"""
+        cached = self._digest_cache.get(path)
+        if cached is None:
+            # blake2b is the fastest digest in hashlib and runs the
+            # whole buffer through one C call
+            cached = hashlib.blake2b(self._read(path)).digest()
+            self._digest_cache[path] = cached
+        return cached
+
+    def _bitset(self, path: Path) -> int:
+        """Token bitmask of one file over the interned vocabulary.
+
+        Each distinct token owns one bit position, so a pair comparison
+        is two bitwise ops on arbitrary-precision ints plus hardware
+        popcount via int.bit_count() — no per-token set probing at all.
+        """
+        cached = self._bitset_cache.get(path)
+        if cached is None:
+            vocab = self._vocab
+            cached = 0
+            for tok in self._token_set(path):
+                idx = vocab.get(tok)
+                if idx is None:
+                    idx = vocab[tok] = len(vocab)
+                cached |= 1 << idx
+            self._bitset_cache[path] = cached
+        return cached
+
+    # Directories pruned at descent so their subtrees are never walked
+    _EXCLUDED_DIRS = frozenset(('build', 'test', 'tests', '.git'))
+    _CPP_EXTS = frozenset(('.cpp', '.h', '.hpp'))
+
+    def find_all_cpp_files(self) -> List[Path]:
+        """Collect every C++ source and header under src/ and include/"""
+        # One scandir walk classifies by suffix as entries stream in,
+        # instead of one rglob traversal per pattern per base directory
+        files: List[Path] = []
+        stack = [str(self.src_dir), str(self.include_dir)]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in self._EXCLUDED_DIRS:
+                            stack.append(entry.path)
+                    else:
+                        name = entry.name
+                        dot = name.rfind('.')
+                        if dot != -1 and name[dot:] in self._CPP_EXTS \
+                                and 'build' not in entry.path \
+                                and 'test' not in entry.path:
+                            files.append(Path(entry.path))
+        return sorted(files)
+
+    def find_variant_groups(self, files: List[Path]) -> Dict[str, List[Path]]:
+        """Group suffix-variant files with their base implementation"""
+        by_stem = {(f.stem, f.suffix): f for f in files}
+        groups: Dict[str, List[Path]] = {}
+        for f in files:
+            for suffix in VARIANT_SUFFIXES:
+                if f.stem.endswith(suffix):
+                    base_stem = f.stem[:-len(suffix)]
+                    key = f'{base_stem}{f.suffix}'
+                    group = groups.setdefault(key, [])
+                    base = by_stem.get((base_stem, f.suffix))
+                    if base is not None and base not in group:
+                        group.append(base)
+                    group.append(f)
+                    break
+        return groups
+
+    def remove_comments(self, content: bytes) -> bytes:
+        """Strip // and /* */ comments before comparing code"""
+        return _strip_comments(content)
+
+    def extract_functions(self, content: bytes) -> Set[str]:
+        """Function names defined or declared in one file"""
+        return {m.decode()
+                for m in _FUNC_RE.findall(self.remove_comments(content))}
+
+    def extract_classes(self, content: bytes) -> Set[str]:
+        """Class and struct names declared in one file"""
+        return {m.decode()
+                for m in _CLASS_RE.findall(self.remove_comments(content))}
+
+    def calculate_similarity(self, content1: bytes, content2: bytes) -> float:
+        """Jaccard similarity of two files' comment-stripped token sets"""
+        tokens1 = _tokenize(content1)
+        tokens2 = _tokenize(content2)
+        if not tokens1 and not tokens2:
+            return 1.0
+        union = len(tokens1 | tokens2)
+        return len(tokens1 & tokens2) / union if union else 0.0
+
+    def analyze_file_content_similarity(
+            self, groups: Dict[str, List[Path]]) -> List[dict]:
+        """Rate every variant pair in every group.
+
+        Each file is read, hashed and tokenized at most once through the
+        caches; the pair loop only compares precomputed values, so a
+        group of N variants costs N reads instead of N*(N-1).
+        """
+        findings = []
+        for key, group in sorted(groups.items()):
+            for i in range(len(group)):
+                for j in range(i + 1, len(group)):
+                    # Variant copies are very often byte-identical;
+                    # equal content digests decide similarity 1.0
+                    # without tokenizing either file
+                    if self._digest(group[i]) == self._digest(group[j]):
+                        similarity = 1.0
+                    else:
+                        bits_a = self._bitset(group[i])
+                        bits_b = self._bitset(group[j])
+                        # Jaccard is bounded above by min/max of the set
+                        # sizes, so pairs whose popcounts alone rule out
+                        # the threshold skip the bitwise ops entirely
+                        small, large = sorted(
+                            (bits_a.bit_count(), bits_b.bit_count()))
+                        if large and small / large < SIMILARITY_THRESHOLD:
+                            continue
+                        union = (bits_a | bits_b).bit_count()
+                        similarity = (
+                            (bits_a & bits_b).bit_count() / union
+                            if union else 1.0)
+                    if similarity >= SIMILARITY_THRESHOLD:
+                        findings.append({
+                            'group': key,
+                            'file_a': str(group[i].relative_to(self.project_root)),
+                            'file_b': str(group[j].relative_to(self.project_root)),
+                            'similarity': round(similarity, 3),
+                        })
+        return findings
+
+    def find_duplicate_implementations(
+            self, files: List[Path]) -> Dict[str, Dict[str, List[str]]]:
+        """Find functions and classes implemented in more than one file"""
+        function_locations: Dict[str, List[str]] = {}
+        class_locations: Dict[str, List[str]] = {}
+        cpp_files = [f for f in files if f.suffix == '.cpp']
+        # The per-file extraction is independent reads plus regex work,
+        # so it fans out across worker processes and scales with cores
+        with ProcessPoolExecutor() as executor:
+            results = executor.map(
+                _extract_one, (str(f) for f in cpp_files), chunksize=32)
+            for f, (functions, classes) in zip(cpp_files, results):
+                rel = str(f.relative_to(self.project_root))
+                for name in functions:
+                    function_locations.setdefault(name, []).append(rel)
+                for name in classes:
+                    class_locations.setdefault(name, []).append(rel)
+        return {
+            'functions': {name: locs for name, locs
+                          in sorted(function_locations.items())
+                          if len(locs) > 1},
+            'classes': {name: locs for name, locs
+                        in sorted(class_locations.items())
+                        if len(locs) > 1},
+        }
+
+
+class ImplementationDuplicateChecker(DuplicateChecker):
+    """Deeper per-file analysis plus CMake usage tracking."""
+
+    # filename -> CMake files referencing it, built on first use
+    _cmake_index = None
+
+    def find_implementation_files(self) -> Dict[str, List[Path]]:
+        """Group .cpp files that share a stem across directories"""
+        by_stem: Dict[str, List[Path]] = {}
+        for f in self.find_all_cpp_files():
+            if f.suffix == '.cpp':
+                by_stem.setdefault(f.stem, []).append(f)
+        return {stem: paths for stem, paths in sorted(by_stem.items())
+                if len(paths) > 1}
+
+    def analyze_file_contents(self, file_path: Path) -> dict:
+        """Summarize one implementation file"""
+        content = self._read(file_path)
+        total_lines, code_lines = _count_lines(content)
+
+        return {
+            'path': str(file_path.relative_to(self.project_root)),
+            'lines': total_lines,
+            'code_lines': code_lines,
+            'functions': sorted({m.decode()
+                                 for m in _FUNC_RE.findall(content)}),
+            'classes': sorted({m.decode()
+                               for m in _CLASS_RE.findall(content)}),
+            'has_main': b'int main(' in content,
+        }
+
+    def _build_cmake_index(self, needles: Set[str]) -> Dict[str, List[str]]:
+        """Invert every CMake file's source references by basename.
+
+        One walk and one linear scan per CMake file replaces a
+        whole-tree rglob plus substring scan per queried source file.
+        Only basenames of files that actually exist (the needle set)
+        enter the index, so stale references and non-source tokens
+        never allocate an entry.
+        """
+        index: Dict[str, List[str]] = {}
+        for cmake_file in sorted(self.project_root.rglob('CMakeLists.txt')):
+            try:
+                content = cmake_file.read_text(
+                    encoding='utf-8', errors='replace')
+            except OSError:
+                continue
+            rel = str(cmake_file.relative_to(self.project_root))
+            for token in set(_CMAKE_TOKEN_RE.findall(content)):
+                name = token.rpartition('/')[2]
+                if name in needles:
+                    index.setdefault(name, []).append(rel)
+        return index
+
+    def check_cmake_usage(self, file_path: Path) -> List[str]:
+        """Find the CMakeLists.txt files that reference a source file"""
+        if self._cmake_index is None:
+            self._cmake_index = self._build_cmake_index(
+                {f.name for f in self.find_all_cpp_files()})
+        return sorted(self._cmake_index.get(file_path.name, ()))
+
+    def generate_report(self) -> dict:
+        """Run every duplicate check and assemble the report dict"""
+        files = self.find_all_cpp_files()
+        groups = self.find_variant_groups(files)
+        similar = self.analyze_file_content_similarity(groups)
+        duplicates = self.find_duplicate_implementations(files)
+
+        variant_details = []
+        for key, group in sorted(groups.items()):
+            for f in group:
+                variant_details.append({
+                    **self.analyze_file_contents(f),
+                    'cmake_usage': self.check_cmake_usage(f),
+                })
+
+        return {
+            'total_files': len(files),
+            'variant_groups': {key: [str(f.relative_to(self.project_root))
+                                     for f in group]
+                               for key, group in sorted(groups.items())},
+            'similar_pairs': similar,
+            'duplicate_functions': duplicates['functions'],
+            'duplicate_classes': duplicates['classes'],
+            'variant_details': variant_details,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Check for duplicate C++ implementations')
+    parser.add_argument('--format', choices=('text', 'json'), default='text',
+                        help='report format (default: text)')
+    parser.add_argument('--output', default='duplicate_report.json',
+                        help='path of the JSON report file')
+    args = parser.parse_args()
+
+    checker = ImplementationDuplicateChecker()
+    report = checker.generate_report()
+
+    # Serialize once, write once; the text branch previously dumped the
+    # same report twice (args.output plus the hard-coded default)
+    if orjson is not None:
+        payload = orjson.dumps(report, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(report, indent=2).encode()
+    with open(args.output, 'wb') as f:
+        f.write(payload)
+
+    if args.format != 'json':
+        print("=" * 60)
+        print("DUPLICATE IMPLEMENTATION REPORT")
+        print("=" * 60)
+        print(f"Files scanned: {report['total_files']}")
+        print(f"Variant groups: {len(report['variant_groups'])}")
+        for key, members in report['variant_groups'].items():
+            print(f"  {key}:")
+            for member in members:
+                print(f"    {member}")
+        print(f"Similar variant pairs (>= {SIMILARITY_THRESHOLD}):"
+              f" {len(report['similar_pairs'])}")
+        for pair in report['similar_pairs']:
+            print(f"  {pair['file_a']} ~ {pair['file_b']}"
+                  f" ({pair['similarity']:.0%})")
+        print(f"Functions implemented in multiple files:"
+              f" {len(report['duplicate_functions'])}")
+        print(f"Classes implemented in multiple files:"
+              f" {len(report['duplicate_classes'])}")
+        print(f"\nDetailed report saved to {args.output}")
+
+    return 1 if report['similar_pairs'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
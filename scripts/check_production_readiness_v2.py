@@ -57,27 +57,41 @@ class ProductionReadinessChecker:
                 lines = content.split('\n')
                 
             relative_path = file_path.relative_to(self.root_dir)
-            
+
+            # Fast literal pre-check: decide once per file which checks can
+            # possibly fire, so clean files skip the per-line regex scans
+            # entirely and only pay for a few C-level substring searches.
+            lower_content = content.lower()
+            may_have_todo = 'TODO' in content
+            may_have_simplified = any(w in lower_content for w in ('simplified', 'placeholder', 'stub', 'mock'))
+            may_have_not_impl = 'implemented' in lower_content
+            may_have_ellipsis = '...' in content
+            may_have_conflict = '<<<<<<<' in content or '>>>>>>>' in content or '=======' in content
+            may_have_xxx = 'XXX' in content
+            may_have_hack = 'hack' in lower_content
+            may_have_temp = 'temp' in lower_content
+            may_have_for_now = 'now' in lower_content
+
             # Check for various patterns line by line
             for i, line in enumerate(lines, 1):
                 # Skip empty lines
                 if not line.strip():
                     continue
-                    
+
                 # TODO comments (but not TODO: or @todo in documentation)
-                if re.search(r'\bTODO\b(?!:)', line) and not re.search(r'[@\\]\s*todo\b', line, re.I):
+                if may_have_todo and re.search(r'\bTODO\b(?!:)', line) and not re.search(r'[@\\]\s*todo\b', line, re.I):
                     self.issues.append((str(relative_path), i, "TODO comment found"))
-                
+
                 # Simplified/placeholder implementations
-                if re.search(r'(simplified|placeholder|stub|mock)\s+(implementation|version)', line, re.I):
+                if may_have_simplified and re.search(r'(simplified|placeholder|stub|mock)\s+(implementation|version)', line, re.I):
                     self.issues.append((str(relative_path), i, "Simplified implementation found"))
-                
+
                 # Not implemented
-                if re.search(r'not\s+implemented|NotImplemented', line, re.I):
+                if may_have_not_impl and re.search(r'not\s+implemented|NotImplemented', line, re.I):
                     self.issues.append((str(relative_path), i, "Not implemented found"))
-                
+
                 # Ellipsis in code (not in comments or strings)
-                if '...' in line:
+                if may_have_ellipsis and '...' in line:
                     # Check if it's in a comment
                     comment_pos = line.find('//')
                     ellipsis_pos = line.find('...')
@@ -91,25 +105,25 @@ class ProductionReadinessChecker:
                                 self.issues.append((str(relative_path), i, "Ellipsis (...) found - possible incomplete code"))
                 
                 # Merge conflict markers
-                if line.strip() in ['<<<<<<<', '=======', '>>>>>>>'] or \
-                   re.match(r'^(<<<<<<<|=======|>>>>>>>)\s+\w+', line):
+                if may_have_conflict and (line.strip() in ['<<<<<<<', '=======', '>>>>>>>'] or
+                   re.match(r'^(<<<<<<<|=======|>>>>>>>)\s+\w+', line)):
                     self.issues.append((str(relative_path), i, "Merge conflict markers found"))
-                
+
                 # XXX markers
-                if re.search(r'\bXXX\b', line):
+                if may_have_xxx and re.search(r'\bXXX\b', line):
                     self.issues.append((str(relative_path), i, "XXX marker found"))
-                
+
                 # HACK comments
-                if re.search(r'\bHACK\b', line, re.I):
+                if may_have_hack and re.search(r'\bHACK\b', line, re.I):
                     self.issues.append((str(relative_path), i, "HACK comment found"))
-                
+
                 # Temporary code
-                if re.search(r'\b(temp|temporary|TEMP|TEMPORARY)\b', line) and \
+                if may_have_temp and re.search(r'\b(temp|temporary|TEMP|TEMPORARY)\b', line) and \
                    not re.search(r'(template|temperature)', line, re.I):
                     self.issues.append((str(relative_path), i, "Temporary code found"))
-                
+
                 # "For now" comments
-                if re.search(r'for\s+now', line, re.I):
+                if may_have_for_now and re.search(r'for\s+now', line, re.I):
                     self.issues.append((str(relative_path), i, '"for now" comment found'))
                 
         except Exception as e: